@@ -0,0 +1,661 @@
+"""Replay historical candles through the trading pipeline.
+
+Every bar after the warm-up is turned into a snapshot (``compute_features`` plus
+the configured indicator kernels), encoded with ``build_prompt`` and sent to the
+providers. The per-bar decisions are kept as a ``DecisionLog`` so they can be
+saved and replayed later without calling the models again. ``simulate`` then
+votes with ``Ensemble.vote``, sizes each entry through ``ExecutionClient`` (paper
+account and ``RiskManager`` on simulated time) and resolves every stop/take exit
+with one vectorized pass over the price series.
+
+Usage: python -m ai_trading.backtest candles.csv --symbol BTC/USDT
+           [--replay decisions.npz] [--record decisions.npz] [--trades trades.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .candles import OHLCV_COLUMNS, timeframe_ms
+from .config import Config, DEFAULT_CONFIG_PATH
+from .data import MarketDataClient
+from .ensemble import Ensemble
+from .execution import ExecutionClient
+from .indicators import indicator_series
+from .models.base import ModelProvider
+from .risk import RiskManager
+from .strategy import build_prompt
+from .types import ModelDecision, TradeAction
+
+LOGGER = logging.getLogger(__name__)
+
+SIDES = {TradeAction.BUY: 1, TradeAction.SELL: -1, TradeAction.NONE: 0}
+ACTIONS = {1: TradeAction.BUY, -1: TradeAction.SELL, 0: TradeAction.NONE}
+
+EXIT_STOP, EXIT_TAKE, EXIT_TIMEOUT = 0, 1, 2
+EXIT_REASONS = ("stop", "take", "timeout")
+
+_FIELD = re.compile(r"(\w+)=(\S+)")
+_SYMBOL = re.compile(r"^Symbol: (\S+)$", re.MULTILINE)
+_CANDLE = re.compile(r"\bcandle=(\S+)")
+_EXIT_CHUNK = 4096
+
+
+def load_ohlcv(path: Path) -> np.ndarray:
+    """Read a CSV or Parquet file into a (bars, 6) array sorted by candle time.
+
+    Columns are matched case-insensitively against ``OHLCV_COLUMNS``. Timestamps
+    may be epoch seconds or milliseconds or any format ``pandas.to_datetime``
+    understands (naive times are taken as UTC). Duplicate candles keep the last row.
+    """
+    path = Path(path)
+    if path.suffix.lower() in {".parquet", ".pq"}:
+        try:
+            frame = pd.read_parquet(path)
+        except ImportError as exc:
+            raise RuntimeError("Reading Parquet files requires pyarrow or fastparquet") from exc
+    else:
+        frame = pd.read_csv(path)
+    if "timestamp" not in {str(c).strip().lower() for c in frame.columns}:
+        frame = frame.reset_index()
+    frame.columns = [str(column).strip().lower() for column in frame.columns]
+    missing = [column for column in OHLCV_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"{path} is missing OHLCV columns {missing}")
+
+    timestamps = frame["timestamp"]
+    if pd.api.types.is_numeric_dtype(timestamps):
+        millis = timestamps.to_numpy(dtype=np.float64)
+        if len(millis) and np.nanmax(millis) < 1e11:
+            millis = millis * 1000
+    else:
+        millis = pd.to_datetime(timestamps, utc=True).dt.as_unit("ms").astype("int64").to_numpy()
+
+    candles = np.column_stack(
+        [millis.astype(np.float64)]
+        + [frame[column].to_numpy(dtype=np.float64) for column in OHLCV_COLUMNS[1:]]
+    )
+    candles = candles[~np.isnan(candles).any(axis=1)]
+    candles = candles[np.argsort(candles[:, 0], kind="stable")]
+    if len(candles):
+        candles = candles[np.append(candles[1:, 0] != candles[:-1, 0], True)]
+    return candles
+
+
+def _parse_time(value: str) -> int:
+    return int(pd.Timestamp(value, tz="UTC").value // 1_000_000)
+
+
+def simulate_exits(
+    candles: np.ndarray,
+    entry: np.ndarray,
+    side: np.ndarray,
+    stop_pct: np.ndarray,
+    take_pct: np.ndarray,
+    max_hold: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Exit bar, exit price and reason for trades opened at the open of ``entry``.
+
+    A trade exits on the first bar whose range reaches its stop or take level,
+    and at the close of its ``max_hold``-th bar (or the last bar) otherwise. When
+    both levels fall inside one bar the stop is assumed to fill first; a bar that
+    opens beyond a level fills at its open. A stop or take of 0 disables it.
+    """
+    bars = len(candles)
+    open_, high, low, close = (candles[:, i] for i in range(1, 5))
+    entry = np.asarray(entry, dtype=np.int64)
+    long = np.asarray(side) > 0
+    price = open_[entry]
+    stop_pct = np.where(np.asarray(stop_pct) > 0, stop_pct, np.nan)
+    take_pct = np.where(np.asarray(take_pct) > 0, take_pct, np.nan)
+    stop_level = np.where(long, price * (1 - stop_pct), price * (1 + stop_pct))
+    take_level = np.where(long, price * (1 + take_pct), price * (1 - take_pct))
+
+    exit_bar = np.minimum(entry + max_hold - 1, bars - 1)
+    reason = np.full(len(entry), EXIT_TIMEOUT, dtype=np.int8)
+    offsets = np.arange(max(1, max_hold))
+    # Chunked so the (trades x max_hold) windows stay small for long series.
+    for start in range(0, len(entry), _EXIT_CHUNK):
+        chunk = slice(start, start + _EXIT_CHUNK)
+        window = entry[chunk, None] + offsets
+        valid = window < bars
+        window = np.minimum(window, bars - 1)
+        is_long = long[chunk, None]
+        stop, take = stop_level[chunk, None], take_level[chunk, None]
+        stop_hit = valid & np.where(is_long, low[window] <= stop, high[window] >= stop)
+        take_hit = valid & np.where(is_long, high[window] >= take, low[window] <= take)
+        hit = stop_hit | take_hit
+        any_hit = hit.any(axis=1)
+        first = hit.argmax(axis=1)
+        rows = np.arange(len(first))
+        exit_bar[chunk] = np.where(any_hit, window[rows, first], exit_bar[chunk])
+        reason[chunk] = np.where(
+            any_hit, np.where(stop_hit[rows, first], EXIT_STOP, EXIT_TAKE), EXIT_TIMEOUT
+        )
+
+    is_stop = reason == EXIT_STOP
+    level = np.where(is_stop, stop_level, take_level)
+    bar_open = open_[exit_bar]
+    # Gaps: the stop fills at a worse open, the take at a better one.
+    beyond = np.where(long == is_stop, bar_open < level, bar_open > level)
+    exit_price = np.where(beyond, bar_open, level)
+    exit_price = np.where(reason == EXIT_TIMEOUT, close[exit_bar], exit_price)
+    return exit_bar, exit_price, reason
+
+
+@dataclass
+class DecisionLog:
+    """Provider decisions per decision bar, as arrays of shape (bars, providers).
+
+    ``side`` is 1 for buy, -1 for sell and 0 for hold; failed calls have a NaN
+    confidence and are left out of the vote.
+    """
+
+    symbol: str
+    timeframe: str
+    providers: List[str]
+    bar: np.ndarray
+    candle_time: np.ndarray
+    side: np.ndarray
+    confidence: np.ndarray
+    stop_pct: np.ndarray
+    take_pct: np.ndarray
+
+    @classmethod
+    def empty(
+        cls,
+        symbol: str,
+        timeframe: str,
+        providers: Sequence[str],
+        bars: np.ndarray,
+        candle_time: np.ndarray,
+    ) -> "DecisionLog":
+        shape = (len(bars), len(providers))
+        return cls(
+            symbol=symbol,
+            timeframe=timeframe,
+            providers=list(providers),
+            bar=np.asarray(bars, dtype=np.int64),
+            candle_time=np.asarray(candle_time, dtype=np.int64),
+            side=np.zeros(shape, dtype=np.int8),
+            confidence=np.full(shape, np.nan),
+            stop_pct=np.zeros(shape),
+            take_pct=np.zeros(shape),
+        )
+
+    def __len__(self) -> int:
+        return len(self.bar)
+
+    def record(self, row: int, column: int, decision: ModelDecision) -> None:
+        self.side[row, column] = SIDES[decision.action]
+        self.confidence[row, column] = decision.confidence
+        self.stop_pct[row, column] = decision.stop_pct
+        self.take_pct[row, column] = decision.take_pct
+
+    def decisions(self, row: int) -> List[ModelDecision]:
+        side, confidence, stop_pct, take_pct = (values[row] for values in self._rows)
+        return [
+            ModelDecision(
+                action=ACTIONS[side[column]],
+                confidence=confidence[column],
+                stop_pct=stop_pct[column],
+                take_pct=take_pct[column],
+                reason="",
+                provider=name,
+                symbol=self.symbol,
+            )
+            for column, name in enumerate(self.providers)
+            if not math.isnan(confidence[column])
+        ]
+
+    @cached_property
+    def _rows(self) -> Tuple[list, ...]:
+        # Python lists: indexing them per decision is much cheaper than NumPy scalars.
+        return tuple(
+            values.tolist() for values in (self.side, self.confidence, self.stop_pct, self.take_pct)
+        )
+
+    def save(self, path: Path) -> None:
+        meta = {"symbol": self.symbol, "timeframe": self.timeframe, "providers": self.providers}
+        np.savez_compressed(
+            path,
+            meta=np.array(json.dumps(meta)),
+            bar=self.bar,
+            candle_time=self.candle_time,
+            side=self.side,
+            confidence=self.confidence,
+            stop_pct=self.stop_pct,
+            take_pct=self.take_pct,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "DecisionLog":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {name: data[name] for name in data.files if name != "meta"}
+        return cls(**meta, **arrays)
+
+
+class RuleProvider(ModelProvider):
+    """Deterministic provider answering from the ``name=value`` snapshot in the prompt.
+
+    Mean-reverting by default: buy at or below ``lower``, sell at or above
+    ``upper``. With ``trend`` the sides are swapped. Confidence grows from 0.5 at
+    the threshold to 1.0 at ``scale`` beyond it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        feature: str,
+        lower: float,
+        upper: float,
+        scale: float,
+        trend: bool = False,
+        stop_pct: float = 0.01,
+        take_pct: float = 0.02,
+    ) -> None:
+        super().__init__(name)
+        self.model = f"rule-{feature}"
+        self.feature = feature
+        self.lower = lower
+        self.upper = upper
+        self.scale = scale
+        self.trend = trend
+        self.stop_pct = stop_pct
+        self.take_pct = take_pct
+
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        fields = dict(_FIELD.findall(prompt))
+        value = float(fields[self.feature])
+        if value <= self.lower:
+            action, excess = ("sell" if self.trend else "buy"), self.lower - value
+        elif value >= self.upper:
+            action, excess = ("buy" if self.trend else "sell"), value - self.upper
+        else:
+            action, excess = "hold", 0.0
+        return json.dumps(
+            {
+                "action": action,
+                "confidence": 0.5 + 0.5 * min(1.0, excess / self.scale),
+                "stop_pct": self.stop_pct,
+                "take_pct": self.take_pct,
+                "reason": f"{self.feature}={value:g}",
+            }
+        )
+
+
+def default_rules() -> Dict[str, ModelProvider]:
+    rules = [
+        RuleProvider("rsi_30_70", "rsi", 30, 70, scale=10),
+        RuleProvider("rsi_35_65", "rsi", 35, 65, scale=10),
+        RuleProvider("momentum", "momentum_5", -0.003, 0.003, scale=0.003, trend=True),
+    ]
+    return {rule.name: rule for rule in rules}
+
+
+class ReplayProvider(ModelProvider):
+    """Answer with the decision one provider gave for the same symbol and candle.
+
+    The backtester looks decisions up by exact ``candle_time`` with
+    ``decision()``; ``complete()`` parses the prompt, whose candle time is
+    rounded to the minute, and so only matches minute-aligned candles.
+    """
+
+    def __init__(self, log: DecisionLog, name: str) -> None:
+        super().__init__(name)
+        self.model = "replay"
+        self._log = log
+        self._column = log.providers.index(name)
+        self._rows = {int(t): row for row, t in enumerate(log.candle_time)}
+
+    def decision(self, candle_time: int) -> ModelDecision:
+        row = self._rows.get(int(candle_time))
+        if row is None or np.isnan(self._log.confidence[row, self._column]):
+            raise KeyError(f"No recorded {self.name} decision at {_to_datetime(candle_time)}")
+        return ModelDecision(
+            action=ACTIONS[int(self._log.side[row, self._column])],
+            confidence=float(self._log.confidence[row, self._column]),
+            stop_pct=float(self._log.stop_pct[row, self._column]),
+            take_pct=float(self._log.take_pct[row, self._column]),
+            reason="replay",
+            provider=self.name,
+            symbol=self._log.symbol,
+        )
+
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        symbol = _SYMBOL.search(prompt)
+        candle = _CANDLE.search(prompt)
+        if not symbol or not candle or symbol.group(1) != self._log.symbol:
+            raise KeyError(f"No recorded decision for prompt {prompt[:80]!r}")
+        decision = self.decision(_parse_time(candle.group(1)))
+        return json.dumps(
+            {
+                "action": decision.action.value,
+                "confidence": decision.confidence,
+                "stop_pct": decision.stop_pct,
+                "take_pct": decision.take_pct,
+                "reason": decision.reason,
+            }
+        )
+
+    @classmethod
+    def from_log(cls, log: DecisionLog) -> Dict[str, ModelProvider]:
+        return {name: cls(log, name) for name in log.providers}
+
+
+@dataclass
+class BacktestResult:
+    symbol: str
+    trades: pd.DataFrame
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        lines = [f"Backtest {self.symbol}"]
+        for key, value in self.stats.items():
+            text = f"{value:.4f}" if isinstance(value, float) else str(value)
+            lines.append(f"  {key:18s} {text}")
+        return "\n".join(lines)
+
+
+class Backtester:
+    def __init__(self, cfg: Config, providers: Dict[str, ModelProvider]) -> None:
+        self.cfg = cfg
+        self.providers = providers
+
+    def snapshots(self, candles: np.ndarray, bars: np.ndarray, timeframe: str) -> List[dict]:
+        """Snapshots as the live engine would have built them at the close of each bar."""
+        frame = pd.DataFrame(candles[:, 1:], columns=OHLCV_COLUMNS[1:])
+        features = MarketDataClient.compute_features(frame).reindex(range(len(candles)))
+        rsi = features["rsi"].to_numpy()
+        momentum = features["momentum_5"].to_numpy()
+        extra = indicator_series(candles, self.cfg.data.indicators)
+        interval = timeframe_ms(timeframe)
+
+        snapshots = []
+        for bar in bars:
+            candle_time, open_, high, low, close, volume = candles[bar]
+            snapshot = {
+                "open": float(open_),
+                "high": float(high),
+                "low": float(low),
+                "close": float(close),
+                "volume": float(volume),
+                "rsi": float(rsi[bar]),
+                "momentum_5": float(momentum[bar]),
+                "candle_time": int(candle_time),
+                "timestamp": datetime.fromtimestamp(
+                    (candle_time + interval) / 1000, tz=timezone.utc
+                ).isoformat(),
+            }
+            if extra:
+                snapshot["indicators"] = {name: float(values[bar]) for name, values in extra.items()}
+            snapshots.append(snapshot)
+        return snapshots
+
+    def decision_bars(self, candles: np.ndarray) -> np.ndarray:
+        # The pandas RSI back-fills its first values, so the warm-up must cover
+        # them; the last bar has no next open to trade at.
+        first = max(self.cfg.backtest.warmup_bars, 15)
+        return np.arange(first, len(candles) - 1)
+
+    async def decide(
+        self, symbol: str, candles: np.ndarray, timeframe: Optional[str] = None
+    ) -> DecisionLog:
+        timeframe = timeframe or self.cfg.data.timeframe
+        bars = self.decision_bars(candles)
+        names = list(self.providers)
+        log = DecisionLog.empty(symbol, timeframe, names, bars, candles[bars, 0])
+        snapshots = self.snapshots(candles, bars, timeframe)
+        providers = list(self.providers.values())
+        # Rule and replay providers never wait on I/O; awaiting them in turn saves
+        # scheduling a task per provider and bar.
+        local = all(isinstance(provider, _LOCAL_PROVIDERS) for provider in providers)
+        failures = 0
+        for row, snapshot in enumerate(snapshots):
+            prompt = build_prompt(symbol, timeframe, snapshot, self.cfg.prompt.precision)
+            candle_time = snapshot["candle_time"]
+            if local:
+                results = [await _generate(p, prompt, candle_time) for p in providers]
+            else:
+                results = await asyncio.gather(
+                    *(_generate(p, prompt, candle_time) for p in providers)
+                )
+            for column, result in enumerate(results):
+                if isinstance(result, BaseException):
+                    failures += 1
+                    LOGGER.debug("Provider %s failed at bar %d: %s", names[column], row, result)
+                else:
+                    log.record(row, column, result)
+        if failures:
+            LOGGER.warning("%d provider calls failed during the replay", failures)
+        silent = [
+            name for column, name in enumerate(names) if np.isnan(log.confidence[:, column]).all()
+        ]
+        if len(bars) and silent:
+            raise RuntimeError(
+                f"Providers {silent} answered none of the {len(bars)} bars; "
+                "check that the decision log matches these candles"
+            )
+        return log
+
+    async def simulate(self, symbol: str, candles: np.ndarray, log: DecisionLog) -> BacktestResult:
+        started = time.perf_counter()
+        ensemble = Ensemble(self.cfg.ensemble)
+        # Rows with fewer actionable votes than the quorum cannot reach consensus.
+        actionable = (log.side != 0) & (log.confidence >= self.cfg.ensemble.min_confidence)
+        quorum = max(1, self.cfg.ensemble.require_agreement)
+        signals = []
+        for row in np.flatnonzero(actionable.sum(axis=1) >= quorum):
+            consensus = ensemble.vote(log.decisions(row))
+            if consensus is not None:
+                signals.append((int(log.bar[row]) + 1, consensus))
+
+        entry = np.array([bar for bar, _ in signals], dtype=np.int64)
+        side = np.array([SIDES[decision.action] for _, decision in signals], dtype=np.int8)
+        stop = np.array([decision.stop_pct for _, decision in signals])
+        take = np.array([decision.take_pct for _, decision in signals])
+        exit_bar, exit_price, reason = simulate_exits(
+            candles, entry, side, stop, take, self.cfg.backtest.max_hold_bars
+        )
+
+        clock = _SimulatedClock()
+        execution = ExecutionClient(self.cfg, None, paper=True)
+        execution.paper_account.balance = self.cfg.backtest.initial_balance
+        execution.risk_manager = RiskManager(self.cfg.risk, clock=clock)
+        fee_rate = self.cfg.backtest.fee_bps / 10_000
+        trades = []
+        blocked = 0
+        busy_until = -1
+        for index, (bar, decision) in enumerate(signals):
+            if bar <= busy_until:
+                continue
+            clock.now = _to_datetime(candles[bar, 0])
+            entry_price = float(candles[bar, 1])
+            order = await execution.execute(
+                symbol, decision.action, entry_price, decision.stop_pct, decision.take_pct
+            )
+            if order is None:
+                blocked += 1
+                continue
+            busy_until = int(exit_bar[index])
+            session = execution.risk_manager.session_start
+            clock.now = _to_datetime(candles[busy_until, 0])
+            execution.risk_manager.reset_if_new_day()
+            balance = execution.paper_account.balance
+            execution.paper_account.close_position(symbol, float(exit_price[index]))
+            notional = order.size * entry_price
+            fee = fee_rate * (notional + order.size * float(exit_price[index]))
+            execution.paper_account.balance -= fee
+            pnl = execution.paper_account.balance - balance
+            # Release the risk reserved at entry (unless the day rolled over since)
+            # and book the realised result.
+            released = notional if execution.risk_manager.session_start is session else 0.0
+            execution.risk_manager.session_loss += released + pnl
+            trades.append(
+                {
+                    "entry_time": int(candles[bar, 0]),
+                    "exit_time": int(candles[busy_until, 0]),
+                    "side": decision.action.value,
+                    "confidence": decision.confidence,
+                    "entry_price": entry_price,
+                    "exit_price": float(exit_price[index]),
+                    "size": order.size,
+                    "fee": fee,
+                    "pnl": pnl,
+                    "exit_reason": EXIT_REASONS[reason[index]],
+                    "bars_held": busy_until - bar + 1,
+                    "balance": execution.paper_account.balance,
+                }
+            )
+
+        frame = pd.DataFrame(trades)
+        stats = _stats(frame, self.cfg.backtest.initial_balance)
+        stats.update(
+            bars=len(candles),
+            decision_bars=len(log),
+            signals=len(signals),
+            blocked=blocked,
+            simulate_seconds=time.perf_counter() - started,
+        )
+        return BacktestResult(symbol=symbol, trades=frame, stats=stats)
+
+    async def run(
+        self, symbol: str, candles: np.ndarray, timeframe: Optional[str] = None
+    ) -> Tuple[BacktestResult, DecisionLog]:
+        started = time.perf_counter()
+        log = await self.decide(symbol, candles, timeframe)
+        decided = time.perf_counter() - started
+        result = await self.simulate(symbol, candles, log)
+        result.stats["decide_seconds"] = decided
+        return result, log
+
+
+_LOCAL_PROVIDERS = (RuleProvider, ReplayProvider)
+
+
+async def _generate(provider: ModelProvider, prompt: str, candle_time: int) -> Any:
+    try:
+        if isinstance(provider, ReplayProvider):
+            return provider.decision(candle_time)
+        return await provider.generate(prompt)
+    except Exception as exc:  # pylint: disable=broad-except
+        return exc
+
+
+class _SimulatedClock:
+    def __init__(self) -> None:
+        self.now = datetime.fromtimestamp(0, tz=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _to_datetime(millis: float) -> datetime:
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc)
+
+
+def _stats(trades: pd.DataFrame, initial_balance: float) -> Dict[str, Any]:
+    if trades.empty:
+        return {"trades": 0, "final_balance": initial_balance, "return": 0.0}
+    pnl = trades["pnl"].to_numpy()
+    equity = np.concatenate([[initial_balance], trades["balance"].to_numpy()])
+    peak = np.maximum.accumulate(equity)
+    losses = -pnl[pnl < 0].sum()
+    return {
+        "trades": len(trades),
+        "final_balance": float(equity[-1]),
+        "return": float(equity[-1] / initial_balance - 1),
+        "win_rate": float((pnl > 0).mean()),
+        "profit_factor": float(pnl[pnl > 0].sum() / losses) if losses else float("inf"),
+        "max_drawdown": float(((peak - equity) / peak).max()),
+        "avg_bars_held": float(trades["bars_held"].mean()),
+        "fees": float(trades["fee"].sum()),
+        **{f"exits_{name}": int((trades["exit_reason"] == name).sum()) for name in EXIT_REASONS},
+    }
+
+
+def select_range(candles: np.ndarray, start: Optional[str], end: Optional[str]) -> np.ndarray:
+    mask = np.ones(len(candles), dtype=bool)
+    if start:
+        mask &= candles[:, 0] >= _parse_time(start)
+    if end:
+        mask &= candles[:, 0] < _parse_time(end)
+    return candles[mask]
+
+
+async def _main(args: argparse.Namespace) -> None:
+    cfg = Config.load(args.config)
+    if args.timeframe:
+        cfg.data.timeframe = args.timeframe
+    candles = select_range(load_ohlcv(args.data), args.start, args.end)
+    LOGGER.info("Loaded %d candles from %s", len(candles), args.data)
+
+    engine = None
+    if args.replay:
+        providers = ReplayProvider.from_log(DecisionLog.load(args.replay))
+    elif args.live:
+        from .engine import TradingEngine  # Local import: only live replays need the SDKs
+
+        engine = TradingEngine.from_env(cfg=cfg, paper=True)
+        providers = dict(engine.providers)
+        if engine.anthropic_provider is not None:
+            providers["anthropic"] = engine.anthropic_provider
+    else:
+        providers = default_rules()
+    if not providers:
+        raise SystemExit("No providers available")
+
+    try:
+        result, log = await Backtester(cfg, providers).run(args.symbol, candles)
+    finally:
+        if engine is not None:
+            await engine.aclose()
+    print(result.summary())
+    if args.record:
+        log.save(args.record)
+        print(f"Decisions written to {args.record}")
+    if args.trades:
+        result.trades.to_csv(args.trades, index=False)
+        print(f"Trades written to {args.trades}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("data", type=Path, help="CSV or Parquet file with OHLCV columns")
+    parser.add_argument("--symbol", default="BTC/USDT")
+    parser.add_argument("--timeframe", default=None, help="Candle timeframe of the data file")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--start", default=None, help="First candle time (inclusive)")
+    parser.add_argument("--end", default=None, help="Last candle time (exclusive)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", type=Path, default=None, help="Recorded decisions (.npz)")
+    source.add_argument(
+        "--live", action="store_true", help="Query the configured model providers"
+    )
+    parser.add_argument("--record", type=Path, default=None, help="Save decisions (.npz)")
+    parser.add_argument("--trades", type=Path, default=None, help="Write the trades as CSV")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import BalanceConfig
+from .exchange import AsyncExchange
+from .metrics import STAGE_ERRORS, STAGE_SECONDS
+
+LOGGER = logging.getLogger(__name__)
+
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """Base and quote currency of a ccxt symbol (``BTC/USDT`` or ``BTC/USDT:USDT``)."""
+    base, _, rest = symbol.partition("/")
+    return base, rest.partition(":")[0]
+
+
+class BalanceCache:
+    """Total balance per currency from ``fetch_balance``, reused for ``ttl_seconds``.
+
+    Our own fills are applied to the cached amounts as spot trades (the quote
+    currency pays for a buy, the base currency is credited). A background task
+    refetches every ``refresh_interval`` seconds, which also corrects the
+    approximation for fees and margin accounts. Fills applied while a fetch is
+    in flight may or may not be in its snapshot: those newer than the snapshot's
+    ``timestamp`` are applied again, and when either time is unknown only their
+    debits are, so the cache never overstates a balance. Concurrent lookups of an
+    expired cache share one request.
+    """
+
+    def __init__(
+        self,
+        cfg: BalanceConfig,
+        exchange: AsyncExchange,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.cfg = cfg
+        self.exchange = exchange
+        self.clock = clock
+        self._totals: Dict[str, float] = {}
+        self._fetched_at: Optional[float] = None
+        self._pending: Optional["asyncio.Future[None]"] = None
+        self._fills_in_flight: Optional[List[Tuple[str, str, float, float, Optional[int]]]] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self._fetched_at is not None and (
+            self.clock() - self._fetched_at < self.cfg.ttl_seconds
+        )
+
+    async def get(self, currency: str) -> float:
+        if not self.fresh:
+            await self.refresh()
+        return self._totals.get(currency, 0.0)
+
+    async def refresh(self) -> None:
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._fetch())
+            self._pending.add_done_callback(self._done)
+        await asyncio.shield(self._pending)
+
+    def apply_fill(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: float,
+        timestamp: Optional[int] = None,
+    ) -> None:
+        """Apply one of our fills; ``timestamp`` is its time in epoch milliseconds."""
+        if self._fills_in_flight is not None:
+            self._fills_in_flight.append((symbol, side, amount, price, timestamp))
+        self._apply(symbol, side, amount, price)
+
+    def _apply(
+        self, symbol: str, side: str, amount: float, price: float, debits_only: bool = False
+    ) -> None:
+        base, quote = split_symbol(symbol)
+        sign = 1 if side == "buy" else -1
+        for currency, delta in ((base, sign * amount), (quote, -sign * amount * price)):
+            if not debits_only:
+                self._totals[currency] = self._totals.get(currency, 0.0) + delta
+            elif delta < 0:
+                # The snapshot may already include this debit; spot balances stay >= 0.
+                self._totals[currency] = max(0.0, self._totals.get(currency, 0.0) + delta)
+        LOGGER.debug("Applied %s fill of %.6f %s to cached balances", side, amount, symbol)
+
+    def start(self) -> None:
+        if self.cfg.refresh_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _fetch(self) -> None:
+        self._fills_in_flight = []
+        try:
+            with STAGE_SECONDS.time(STAGE_ERRORS, stage="fetch_balance", symbol="account"):
+                balance = await self.exchange.fetch_balance()
+            self._totals = {
+                currency: float(amount)
+                for currency, amount in (balance.get("total") or {}).items()
+                if amount is not None
+            }
+            taken = balance.get("timestamp")
+            for symbol, side, amount, price, timestamp in self._fills_in_flight:
+                if taken is None or timestamp is None:
+                    self._apply(symbol, side, amount, price, debits_only=True)
+                elif timestamp > taken:
+                    self._apply(symbol, side, amount, price)
+        finally:
+            self._fills_in_flight = None
+        self._fetched_at = self.clock()
+
+    def _done(self, future: "asyncio.Future[None]") -> None:
+        self._pending = None
+        if not future.cancelled() and future.exception() is not None:
+            LOGGER.warning("Failed to fetch balance: %s", future.exception())
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:  # pylint: disable=broad-except
+                pass  # already logged by _done
+            await asyncio.sleep(self.cfg.refresh_interval)
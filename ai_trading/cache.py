@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import CacheConfig
+from .metrics import CACHE_REQUESTS
+from .types import ModelDecision, TradeAction
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _quantize(value: Optional[float], step: float) -> Optional[int]:
+    if value is None or not math.isfinite(value) or step <= 0:
+        return None
+    return int(round(value / step))
+
+
+class DecisionCache:
+    def __init__(self, cfg: CacheConfig, clock: Callable[[], float] = time.time) -> None:
+        self.cfg = cfg
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, ModelDecision]]" = OrderedDict()
+        self._store: Optional[sqlite3.Connection] = None
+        if cfg.path:
+            self._open_store(Path(cfg.path))
+
+    def key(
+        self,
+        provider: str,
+        model: Optional[str],
+        symbol: str,
+        timeframe: str,
+        snapshot: Dict[str, float],
+    ) -> str:
+        close = snapshot.get("close")
+        price_bucket = None
+        if close and close > 0 and self.cfg.price_bucket_bps > 0:
+            price_bucket = int(math.floor(math.log(close) / math.log1p(self.cfg.price_bucket_bps / 1e4)))
+        return json.dumps(
+            [
+                provider,
+                model,
+                symbol,
+                timeframe,
+                snapshot.get("candle_time"),
+                price_bucket,
+                _quantize(snapshot.get("rsi"), self.cfg.rsi_step),
+                _quantize(snapshot.get("momentum_5"), self.cfg.momentum_step),
+            ]
+        )
+
+    def get(self, key: str) -> Optional[ModelDecision]:
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is None and self._store is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is not None and now - entry[0] <= self.cfg.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_REQUESTS.inc(result="hit")
+            return dataclasses.replace(entry[1])
+        if entry is not None:
+            self._entries.pop(key, None)
+        self.misses += 1
+        CACHE_REQUESTS.inc(result="miss")
+        return None
+
+    def put(self, key: str, decision: ModelDecision) -> None:
+        entry = (self.clock(), dataclasses.replace(decision))
+        self._remember(key, entry)
+        if self._store is not None:
+            payload = json.dumps({**dataclasses.asdict(decision), "action": decision.action.value})
+            with self._store:
+                self._store.execute(
+                    "INSERT OR REPLACE INTO decisions (key, created, payload) VALUES (?, ?, ?)",
+                    (key, entry[0], payload),
+                )
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def _remember(self, key: str, entry: Tuple[float, ModelDecision]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(1, self.cfg.max_entries):
+            self._entries.popitem(last=False)
+
+    def _open_store(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._store = sqlite3.connect(str(path))
+        with self._store:
+            self._store.execute(
+                "CREATE TABLE IF NOT EXISTS decisions "
+                "(key TEXT PRIMARY KEY, created REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._store.execute(
+                "DELETE FROM decisions WHERE created < ?", (self.clock() - self.cfg.ttl_seconds,)
+            )
+        LOGGER.info("Decision cache backed by %s", path)
+
+    def _load(self, key: str) -> Optional[Tuple[float, ModelDecision]]:
+        row = self._store.execute(
+            "SELECT created, payload FROM decisions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        created, payload = row
+        values = json.loads(payload)
+        values["action"] = TradeAction(values["action"])
+        return created, ModelDecision(**values)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import ccxt
+import numpy as np
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def timeframe_ms(timeframe: str) -> int:
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+class CandleBuffer:
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Candle buffer capacity must be positive")
+        self.capacity = capacity
+        self._data = np.empty((capacity, len(OHLCV_COLUMNS)), dtype=float)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        if not self._size:
+            return None
+        return int(self._data[self._size - 1, 0])
+
+    def reset(self, rows: Sequence[Sequence[float]]) -> None:
+        array = np.asarray(rows, dtype=float).reshape(-1, len(OHLCV_COLUMNS))[-self.capacity :]
+        self._size = len(array)
+        self._data[: self._size] = array
+
+    def merge(self, rows: Sequence[Sequence[float]], interval_ms: int) -> bool:
+        # Returns False when the delta does not line up with the cached candles
+        # (missing bars or a dropped forming bar); the caller should rebuild.
+        last_ts = self.last_timestamp
+        if last_ts is None:
+            return False
+        if not len(rows):
+            return True
+        delta = np.asarray(rows, dtype=float).reshape(-1, len(OHLCV_COLUMNS))
+        delta = delta[delta[:, 0] >= last_ts]
+        if not len(delta):
+            return True
+        if int(delta[0, 0]) != last_ts:
+            return False
+        if len(delta) > 1 and np.any(np.diff(delta[:, 0]) != interval_ms):
+            return False
+
+        self._data[self._size - 1] = delta[0]
+        self._append(delta[1:])
+        return True
+
+    def _append(self, rows: np.ndarray) -> None:
+        if not len(rows):
+            return
+        if len(rows) >= self.capacity:
+            self.reset(rows)
+            return
+        overflow = self._size + len(rows) - self.capacity
+        if overflow > 0:
+            self._data[: self._size - overflow] = self._data[overflow : self._size]
+            self._size -= overflow
+        self._data[self._size : self._size + len(rows)] = rows
+        self._size += len(rows)
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
+import logging
+import os
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import yaml
 
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ProviderPolicyConfig:
+    window: int = 50
+    hedge: bool = True
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 10
+    breaker_failures: int = 3
+    breaker_error_rate: float = 0.5
+    breaker_min_calls: int = 10
+    breaker_cooldown: float = 60.0
+
 
 @dataclass
 class ProviderConfig:
@@ -14,26 +32,124 @@ class ProviderConfig:
     temperature: float = 0.2
     top_p: float = 1.0
     max_tokens: int = 512
+    max_output_tokens: int = 4096
     timeout: float = 30.0
+    stream: bool = False
+    policy: ProviderPolicyConfig = field(default_factory=ProviderPolicyConfig)
+
+
+@dataclass
+class HttpConfig:
+    http2: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    prewarm: bool = True
 
 
 @dataclass
 class EnsembleConfig:
     min_confidence: float = 0.6
     require_agreement: int = 2
+    early_exit: bool = False
 
 
 @dataclass
 class RiskConfig:
+    # Both are fractions of the current balance of the traded quote currency.
     risk_per_trade: float = 0.01
     daily_loss_limit: float = 0.05
     kill_switch: bool = True
 
 
+@dataclass
+class BalanceConfig:
+    ttl_seconds: float = 30.0
+    refresh_interval: float = 15.0
+
+
+@dataclass
+class OrderConfig:
+    max_in_flight: int = 4
+    poll_interval: float = 1.0
+
+
 @dataclass
 class DataConfig:
     timeframe: str = "5m"
     lookback: int = 200
+    incremental: bool = True
+    delta_limit: int = 10
+    feature_mode: str = "streaming"
+    indicators: List[str] = field(default_factory=list)
+
+
+@dataclass
+class EngineConfig:
+    max_concurrency: int = 1
+
+
+@dataclass
+class CacheConfig:
+    enabled: bool = False
+    ttl_seconds: float = 300.0
+    max_entries: int = 1024
+    price_bucket_bps: float = 5.0
+    rsi_step: float = 1.0
+    momentum_step: float = 0.0005
+    path: Optional[str] = None
+
+
+@dataclass
+class GateConfig:
+    enabled: bool = False
+    price_bps: float = 10.0
+    rsi_delta: float = 2.0
+    momentum_delta: float = 0.001
+    max_age_seconds: float = 900.0
+
+
+@dataclass
+class PromptConfig:
+    batch_size: int = 1
+    precision: int = 6
+    cache_prefix: bool = True
+
+
+@dataclass
+class ScheduleConfig:
+    offset_seconds: float = 2.0
+    timeframes: Dict[str, Optional[List[str]]] = field(default_factory=dict)
+
+
+@dataclass
+class MetricsConfig:
+    exporter: bool = False
+    host: str = "0.0.0.0"
+    port: int = 9108
+
+
+@dataclass
+class PriceConfig:
+    enabled: bool = True
+    poll_interval: float = 2.0
+    max_age_seconds: float = 10.0
+
+
+@dataclass
+class SignalConfig:
+    queue_size: int = 1000
+    workers: int = 4
+    coalesce_seconds: float = 5.0
+    history: int = 10_000
+
+
+@dataclass
+class BacktestConfig:
+    initial_balance: float = 10_000.0
+    fee_bps: float = 0.0
+    warmup_bars: int = 50
+    max_hold_bars: int = 288
 
 
 @dataclass
@@ -41,6 +157,8 @@ class ExchangeConfig:
     name: str = "mexc"
     params: Dict[str, object] = field(default_factory=dict)
     testnet: bool = True
+    backend: str = "async"
+    max_workers: int = 4
 
 
 @dataclass
@@ -49,8 +167,20 @@ class Config:
     providers: Dict[str, ProviderConfig]
     ensemble: EnsembleConfig = field(default_factory=EnsembleConfig)
     risk: RiskConfig = field(default_factory=RiskConfig)
+    balance: BalanceConfig = field(default_factory=BalanceConfig)
+    orders: OrderConfig = field(default_factory=OrderConfig)
     data: DataConfig = field(default_factory=DataConfig)
     exchange: ExchangeConfig = field(default_factory=ExchangeConfig)
+    engine: EngineConfig = field(default_factory=EngineConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    gate: GateConfig = field(default_factory=GateConfig)
+    prompt: PromptConfig = field(default_factory=PromptConfig)
+    http: HttpConfig = field(default_factory=HttpConfig)
+    schedule: ScheduleConfig = field(default_factory=ScheduleConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    prices: PriceConfig = field(default_factory=PriceConfig)
+    signals: SignalConfig = field(default_factory=SignalConfig)
+    backtest: BacktestConfig = field(default_factory=BacktestConfig)
     webhook_secret: Optional[str] = None
 
     @staticmethod
@@ -59,7 +189,10 @@ class Config:
             raw = yaml.safe_load(fh)
 
         providers_cfg = {
-            name: ProviderConfig(**values) for name, values in raw.get("providers", {}).items()
+            name: ProviderConfig(
+                **{**values, "policy": ProviderPolicyConfig(**(values.get("policy") or {}))}
+            )
+            for name, values in raw.get("providers", {}).items()
         }
 
         return Config(
@@ -67,10 +200,90 @@ class Config:
             providers=providers_cfg,
             ensemble=EnsembleConfig(**raw.get("ensemble", {})),
             risk=RiskConfig(**raw.get("risk", {})),
+            balance=BalanceConfig(**raw.get("balance", {})),
+            orders=OrderConfig(**raw.get("orders", {})),
             data=DataConfig(**raw.get("data", {})),
             exchange=ExchangeConfig(**raw.get("exchange", {})),
+            engine=EngineConfig(**raw.get("engine", {})),
+            cache=CacheConfig(**raw.get("cache", {})),
+            gate=GateConfig(**raw.get("gate", {})),
+            prompt=PromptConfig(**raw.get("prompt", {})),
+            http=HttpConfig(**raw.get("http", {})),
+            schedule=ScheduleConfig(**raw.get("schedule", {})),
+            metrics=MetricsConfig(**raw.get("metrics", {})),
+            prices=PriceConfig(**raw.get("prices", {})),
+            signals=SignalConfig(**raw.get("signals", {})),
+            backtest=BacktestConfig(**raw.get("backtest", {})),
             webhook_secret=raw.get("webhook_secret"),
         )
 
 
 DEFAULT_CONFIG_PATH = Path("config.yaml")
+
+
+class ConfigStore:
+    """Parsed config kept in memory and reloaded when the file's mtime changes.
+
+    ``get()`` stats the file at most once per ``check_interval`` seconds. A reload
+    parses the whole file before swapping it in, so readers see either the old
+    or the new ``Config``; a file that fails to parse keeps the previous one.
+    Listeners are called with each newly loaded config.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CONFIG_PATH,
+        check_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Config], None]] = []
+        self._mtime = self._stat()
+        self._config = Config.load(self.path)
+        self._checked = clock()
+
+    @property
+    def mtime(self) -> Optional[int]:
+        return self._mtime
+
+    def get(self) -> Config:
+        now = self.clock()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            if self._stat() != self._mtime:
+                try:
+                    self.reload()
+                except Exception as exc:  # pylint: disable=broad-except
+                    LOGGER.error("Keeping previous config; failed to reload %s: %s", self.path, exc)
+        return self._config
+
+    def reload(self) -> Config:
+        """Re-read the file now; raises (and keeps the current config) if it is invalid."""
+        with self._lock:
+            mtime = self._stat()
+            try:
+                config = Config.load(self.path)
+            finally:
+                # Do not retry a broken file on every check; wait for the next edit.
+                self._mtime = mtime
+            self._config = config
+            listeners = list(self._listeners)
+        LOGGER.info("Loaded config from %s", self.path)
+        for listener in listeners:
+            try:
+                listener(config)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.exception("Config listener failed: %s", exc)
+        return config
+
+    def subscribe(self, listener: Callable[[Config], None]) -> None:
+        self._listeners.append(listener)
+
+    def _stat(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
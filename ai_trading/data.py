@@ -1,33 +1,167 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-import ccxt
 import numpy as np
 import pandas as pd
 
+from .candles import OHLCV_COLUMNS, CandleBuffer, timeframe_ms
 from .config import Config
+from .exchange import AsyncExchange
+from .indicators import IndicatorState, batch_features, default_indicators, latest_indicators
+from .metrics import STAGE_ERRORS, STAGE_SECONDS
 
 LOGGER = logging.getLogger(__name__)
 
 
 class MarketDataClient:
-    def __init__(self, cfg: Config, exchange: ccxt.Exchange) -> None:
+    def __init__(self, cfg: Config, exchange: AsyncExchange) -> None:
         self.cfg = cfg
         self.exchange = exchange
+        self._buffers: Dict[Tuple[str, str], CandleBuffer] = {}
+        self._indicator_states: Dict[Tuple[str, str], IndicatorState] = {}
+
+    async def fetch_candles(self, symbol: str, timeframe: Optional[str] = None) -> CandleBuffer:
+        timeframe = timeframe or self.cfg.data.timeframe
+        with STAGE_SECONDS.time(STAGE_ERRORS, stage="fetch_ohlcv", symbol=symbol):
+            return await self._fetch_candles(symbol, timeframe)
+
+    async def _fetch_candles(self, symbol: str, timeframe: str) -> CandleBuffer:
+        key = (symbol, timeframe)
+        buffer = self._buffers.get(key)
+        if self.cfg.data.incremental and buffer is not None and len(buffer):
+            LOGGER.debug("Fetching OHLCV delta for %s since %s", symbol, buffer.last_timestamp)
+            delta: List[List[float]] = await self.exchange.fetch_ohlcv(
+                symbol,
+                timeframe=timeframe,
+                since=buffer.last_timestamp,
+                limit=self.cfg.data.delta_limit,
+            )
+            if len(delta) < self.cfg.data.delta_limit and buffer.merge(
+                delta, timeframe_ms(timeframe)
+            ):
+                return buffer
+            LOGGER.info("Candle gap detected for %s %s, rebuilding cache", symbol, timeframe)
 
-    def fetch_ohlcv(self, symbol: str) -> pd.DataFrame:
         LOGGER.debug("Fetching OHLCV for %s", symbol)
-        raw: List[List[float]] = self.exchange.fetch_ohlcv(
-            symbol, timeframe=self.cfg.data.timeframe, limit=self.cfg.data.lookback
-        )
-        df = pd.DataFrame(
-            raw,
-            columns=["timestamp", "open", "high", "low", "close", "volume"],
+        raw: List[List[float]] = await self.exchange.fetch_ohlcv(
+            symbol, timeframe=timeframe, limit=self.cfg.data.lookback
         )
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
+        buffer = CandleBuffer(self.cfg.data.lookback)
+        buffer.reset(raw)
+        self._buffers[key] = buffer
+        return buffer
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: Optional[str] = None) -> pd.DataFrame:
+        buffer = await self.fetch_candles(symbol, timeframe)
+        return self._to_frame(buffer.data)
+
+    async def snapshot(self, symbol: str, timeframe: Optional[str] = None) -> dict:
+        timeframe = timeframe or self.cfg.data.timeframe
+        buffer = await self.fetch_candles(symbol, timeframe)
+        if not len(buffer):
+            raise ValueError("No market data available")
+        with STAGE_SECONDS.time(STAGE_ERRORS, stage="features", symbol=symbol):
+            return self._snapshot_from(symbol, timeframe, buffer)
+
+    def _snapshot_from(self, symbol: str, timeframe: str, buffer: CandleBuffer) -> dict:
+        mode = self.cfg.data.feature_mode
+        if mode == "pandas":
+            features = self.compute_features(self._to_frame(buffer.data))
+            return self.latest_snapshot(features, self.extra_indicators(buffer.data))
+        if mode == "batch":
+            return self.batch_snapshots({symbol: buffer.data})[symbol]
+
+        key = (symbol, timeframe)
+        state = self._indicator_states.get(key)
+        if state is None:
+            state = self._indicator_states[key] = IndicatorState(default_indicators())
+        features = state.update(buffer.data)
+        return self._build_snapshot(buffer.data[-1], features, self.extra_indicators(buffer.data))
+
+    async def snapshots(self, symbols: List[str], timeframe: Optional[str] = None) -> Dict[str, dict]:
+        semaphore = asyncio.Semaphore(max(1, self.cfg.engine.max_concurrency))
+
+        async def fetch(symbol: str) -> CandleBuffer:
+            async with semaphore:
+                return await self.fetch_candles(symbol, timeframe)
+
+        async def single(symbol: str) -> dict:
+            async with semaphore:
+                return await self.snapshot(symbol, timeframe)
+
+        if self.cfg.data.feature_mode != "batch":
+            results = await asyncio.gather(*(single(symbol) for symbol in symbols), return_exceptions=True)
+            snapshots: Dict[str, dict] = {}
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, BaseException):
+                    LOGGER.error("Failed to build snapshot for %s: %s", symbol, result, exc_info=result)
+                else:
+                    snapshots[symbol] = result
+            return snapshots
+
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+        candles: Dict[str, np.ndarray] = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, BaseException):
+                LOGGER.error("Failed to fetch candles for %s: %s", symbol, result, exc_info=result)
+            elif not len(result):
+                LOGGER.error("No market data available for %s", symbol)
+            else:
+                candles[symbol] = result.data
+        with STAGE_SECONDS.time(STAGE_ERRORS, stage="features", symbol="batch"):
+            return self.batch_snapshots(candles)
+
+    def batch_snapshots(self, candles: Dict[str, np.ndarray]) -> Dict[str, dict]:
+        groups: Dict[int, List[str]] = {}
+        for symbol, data in candles.items():
+            groups.setdefault(len(data), []).append(symbol)
+
+        snapshots: Dict[str, dict] = {}
+        for group in groups.values():
+            stack = np.stack([candles[symbol] for symbol in group])
+            base, extra = batch_features(stack, self.cfg.data.indicators)
+            for i, symbol in enumerate(group):
+                snapshots[symbol] = self._build_snapshot(
+                    stack[i, -1],
+                    {name: values[i] for name, values in base.items()},
+                    {name: float(values[i]) for name, values in extra.items()},
+                )
+        return snapshots
+
+    @staticmethod
+    def _build_snapshot(
+        candle: np.ndarray, features: Dict[str, float], indicators: Dict[str, float]
+    ) -> dict:
+        candle_time, open_, high, low, close, volume = candle
+        snapshot = {
+            "open": float(open_),
+            "high": float(high),
+            "low": float(low),
+            "close": float(close),
+            "volume": float(volume),
+            "rsi": float(features["rsi"]),
+            "momentum_5": float(features["momentum_5"]),
+            "candle_time": int(candle_time),
+            "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        }
+        if indicators:
+            snapshot["indicators"] = indicators
+        return snapshot
+
+    def extra_indicators(self, candles: np.ndarray) -> Dict[str, float]:
+        if not self.cfg.data.indicators or not len(candles):
+            return {}
+        values = latest_indicators(candles, self.cfg.data.indicators)
+        return {name: float(value) for name, value in values.items()}
+
+    @staticmethod
+    def _to_frame(candles: np.ndarray) -> pd.DataFrame:
+        df = pd.DataFrame(candles, columns=OHLCV_COLUMNS)
+        df["timestamp"] = pd.to_datetime(df["timestamp"].astype("int64"), unit="ms", utc=True)
         return df.set_index("timestamp")
 
     @staticmethod
@@ -42,9 +176,9 @@ class MarketDataClient:
         return df
 
     @staticmethod
-    def latest_snapshot(df: pd.DataFrame) -> dict:
+    def latest_snapshot(df: pd.DataFrame, indicators: Optional[Dict[str, float]] = None) -> dict:
         latest = df.iloc[-1]
-        return {
+        snapshot = {
             "open": float(latest["open"]),
             "high": float(latest["high"]),
             "low": float(latest["low"]),
@@ -52,8 +186,12 @@ class MarketDataClient:
             "volume": float(latest["volume"]),
             "rsi": float(latest["rsi"]),
             "momentum_5": float(latest["momentum_5"]),
+            "candle_time": int(df.index[-1].timestamp() * 1000),
             "timestamp": datetime.now(tz=timezone.utc).isoformat(),
         }
+        if indicators:
+            snapshot["indicators"] = dict(indicators)
+        return snapshot
 
     @staticmethod
     def _compute_rsi(series: pd.Series, period: int) -> pd.Series:
@@ -64,4 +202,4 @@ class MarketDataClient:
         avg_loss = loss.rolling(window=period, min_periods=period).mean()
         rs = avg_gain / avg_loss.replace({0: np.nan})
         rsi = 100 - (100 / (1 + rs))
-        return rsi.fillna(method="bfill").fillna(50)
+        return rsi.bfill().fillna(50)
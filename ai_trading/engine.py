@@ -5,14 +5,26 @@ import logging
 import os
 from typing import Dict, List, Optional
 
-import ccxt
-
+from .cache import DecisionCache
 from .config import Config, DEFAULT_CONFIG_PATH
 from .data import MarketDataClient
 from .ensemble import Ensemble
+from .exchange import AsyncExchange, exchange_module, wrap_exchange
+from .gate import ChangeGate
+from .metrics import (
+    CYCLE_SECONDS,
+    PROVIDER_ERRORS,
+    PROVIDER_SECONDS,
+    STAGE_ERRORS,
+    STAGE_SECONDS,
+)
 from .models.anthropic_provider import AnthropicProvider
-from .models.openai_provider import GrokProvider, OpenAICompatibleProvider, OpenAIProvider
-from .strategy import build_prompt
+from .models.base import ModelProvider
+from .models.http import HttpPool
+from .models.openai_provider import GrokProvider, OpenAIProvider
+from .models.resilience import ProviderUnavailable, ResilientProvider
+from .prices import PriceCache
+from .strategy import build_batch_prompt, build_prompt
 from .types import ModelDecision
 
 LOGGER = logging.getLogger(__name__)
@@ -22,10 +34,12 @@ class TradingEngine:
     def __init__(
         self,
         cfg: Config,
-        providers: Dict[str, OpenAICompatibleProvider],
-        anthropic_provider: Optional[AnthropicProvider],
+        providers: Dict[str, ModelProvider],
+        anthropic_provider: Optional[ModelProvider],
         market_data: MarketDataClient,
         execution_client,
+        http_pool: Optional[HttpPool] = None,
+        prices: Optional[PriceCache] = None,
     ) -> None:
         self.cfg = cfg
         self.providers = providers
@@ -33,20 +47,77 @@ class TradingEngine:
         self.market_data = market_data
         self.execution = execution_client
         self.ensemble = Ensemble(cfg.ensemble)
+        self.decision_cache = DecisionCache(cfg.cache) if cfg.cache.enabled else None
+        self.gate = ChangeGate(cfg.gate)
+        self.http_pool = http_pool
+        self.prices = prices
+        self._warmup_task: Optional["asyncio.Task[None]"] = None
+
+    async def run_once(
+        self, symbols: Optional[List[str]] = None, timeframe: Optional[str] = None
+    ) -> None:
+        symbols = list(self.cfg.symbols if symbols is None else symbols)
+        timeframe = timeframe or self.cfg.data.timeframe
+        with CYCLE_SECONDS.time(timeframe=timeframe):
+            await self._run_cycle(symbols, timeframe)
+
+        if self.cfg.gate.enabled:
+            LOGGER.info("Change gate stats: %s", self.gate.stats())
+        if self.decision_cache:
+            LOGGER.info("Decision cache stats: %s", self.decision_cache.stats())
+        for provider in self._all_providers():
+            if isinstance(provider, ResilientProvider):
+                LOGGER.info("Provider %s stats: %s", provider.name, provider.stats())
+            if provider.usage.requests:
+                LOGGER.info("Provider %s token usage: %s", provider.name, provider.usage)
+
+    async def _run_cycle(self, symbols: List[str], timeframe: str) -> None:
+        snapshots: Dict[str, dict] = {}
+        batched = self.cfg.prompt.batch_size > 1
+        if batched or self.cfg.data.feature_mode == "batch":
+            snapshots = await self.market_data.snapshots(symbols, timeframe)
+            symbols = [symbol for symbol in symbols if symbol in snapshots]
+
+        if batched:
+            await self._run_batched(symbols, snapshots, timeframe)
+        else:
+            semaphore = asyncio.Semaphore(max(1, self.cfg.engine.max_concurrency))
 
-    async def run_once(self) -> None:
-        for symbol in self.cfg.symbols:
-            LOGGER.info("Processing symbol %s", symbol)
-            df = self.market_data.fetch_ohlcv(symbol)
-            features = self.market_data.compute_features(df)
-            snapshot = self.market_data.latest_snapshot(features)
-            prompt = build_prompt(symbol, self.cfg.data.timeframe, snapshot)
-            decisions = await self._query_models(prompt)
+            async def guarded(symbol: str) -> None:
+                async with semaphore:
+                    await self._process_symbol(symbol, snapshots.get(symbol), timeframe)
+
+            results = await asyncio.gather(
+                *(guarded(symbol) for symbol in symbols), return_exceptions=True
+            )
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, BaseException):
+                    LOGGER.error("Symbol %s failed: %s", symbol, result, exc_info=result)
+
+    async def _process_symbol(
+        self, symbol: str, snapshot: Optional[dict] = None, timeframe: Optional[str] = None
+    ) -> None:
+        LOGGER.info("Processing symbol %s", symbol)
+        timeframe = timeframe or self.cfg.data.timeframe
+        if snapshot is None:
+            snapshot = await self.market_data.snapshot(symbol, timeframe)
+        if not self.gate.should_query(symbol, timeframe, snapshot):
+            return
+        prompt = build_prompt(symbol, timeframe, snapshot, self.cfg.prompt.precision)
+        decisions = await self._query_models(prompt, symbol, snapshot, timeframe)
+        if decisions:
+            self.gate.record(symbol, timeframe, snapshot)
+        with STAGE_SECONDS.time(STAGE_ERRORS, stage="vote", symbol=symbol):
             consensus = self.ensemble.vote(decisions)
-            if not consensus:
-                continue
-            price = snapshot["close"]
-            self.execution.execute(
+        if not consensus:
+            return
+        await self._execute(symbol, consensus, snapshot)
+
+    async def _execute(self, symbol: str, consensus: ModelDecision, snapshot: dict) -> None:
+        # A fresh ticker is closer to the fill price than the close of the last candle.
+        price = (self.prices.get(symbol) if self.prices else None) or snapshot["close"]
+        with STAGE_SECONDS.time(STAGE_ERRORS, stage="execute", symbol=symbol):
+            await self.execution.execute(
                 symbol,
                 consensus.action,
                 price,
@@ -54,26 +125,266 @@ class TradingEngine:
                 consensus.take_pct,
             )
 
-    async def _query_models(self, prompt: str) -> List[ModelDecision]:
-        tasks = [provider.generate(prompt) for provider in self.providers.values()]
-        if self.anthropic_provider:
-            tasks.append(self.anthropic_provider.generate(prompt))
+    async def _run_batched(
+        self, symbols: List[str], snapshots: Dict[str, dict], timeframe: str
+    ) -> None:
+        ready = [s for s in symbols if self.gate.should_query(s, timeframe, snapshots[s])]
+        size = self.cfg.prompt.batch_size
+        chunks = [ready[i : i + size] for i in range(0, len(ready), size)]
+        semaphore = asyncio.Semaphore(max(1, self.cfg.engine.max_concurrency))
+
+        async def run_chunk(chunk: List[str]) -> None:
+            async with semaphore:
+                decisions = await self._query_batch({s: snapshots[s] for s in chunk}, timeframe)
+            for symbol in {d.symbol for d in decisions}:
+                self.gate.record(symbol, timeframe, snapshots[symbol])
+            with STAGE_SECONDS.time(STAGE_ERRORS, stage="vote", symbol="batch"):
+                consensuses = self.ensemble.vote_by_symbol(decisions)
+            for symbol, consensus in consensuses.items():
+                try:
+                    await self._execute(symbol, consensus, snapshots[symbol])
+                except Exception as exc:  # pylint: disable=broad-except
+                    LOGGER.exception("Execution failed for %s: %s", symbol, exc)
+
+        results = await asyncio.gather(*(run_chunk(c) for c in chunks), return_exceptions=True)
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                LOGGER.error("Batch %s failed: %s", chunk, result, exc_info=result)
+
+    async def _query_batch(self, snapshots: Dict[str, dict], timeframe: str) -> List[ModelDecision]:
         decisions: List[ModelDecision] = []
-        for task in asyncio.as_completed(tasks):
-            try:
-                decision = await task
-            except Exception as exc:  # pylint: disable=broad-except
-                LOGGER.exception("Provider failed: %s", exc)
+        calls = []
+        for provider in self._available_providers():
+            keys: Dict[str, str] = {}
+            missing: Dict[str, dict] = {}
+            for symbol, snapshot in snapshots.items():
+                if self.decision_cache:
+                    key = self.decision_cache.key(
+                        provider.name, provider.model, symbol, timeframe, snapshot
+                    )
+                    cached = self.decision_cache.get(key)
+                    if cached:
+                        decisions.append(cached)
+                        continue
+                    keys[symbol] = key
+                missing[symbol] = snapshot
+            # Split so each reply fits in the provider's output token limit.
+            names = list(missing)
+            limit = provider.batch_limit
+            for start in range(0, len(names), limit):
+                part = {symbol: missing[symbol] for symbol in names[start : start + limit]}
+                calls.append((provider, part, keys))
+
+        async def call(provider: ModelProvider, missing: Dict[str, dict], keys: Dict[str, str]):
+            self._ensure_available(provider)
+            prompt = build_batch_prompt(timeframe, missing, self.cfg.prompt.precision)
+            with PROVIDER_SECONDS.time(PROVIDER_ERRORS, provider=provider.name):
+                results = await provider.generate_batch(prompt, list(missing))
+            if self.decision_cache:
+                for decision in results:
+                    self.decision_cache.put(keys[decision.symbol], decision)
+            return results
+
+        results = await asyncio.gather(*(call(*args) for args in calls), return_exceptions=True)
+        for (provider, missing, _), result in zip(calls, results):
+            if isinstance(result, ProviderUnavailable):
+                LOGGER.info(
+                    "Skipping provider %s for batch %s: %s", provider.name, list(missing), result
+                )
                 continue
-            decisions.append(decision)
+            if isinstance(result, BaseException):
+                LOGGER.error(
+                    "Provider %s failed for batch %s: %s",
+                    provider.name,
+                    list(missing),
+                    result,
+                    exc_info=result,
+                )
+                continue
+            decisions.extend(result)
             LOGGER.info(
-                "Provider %s -> %s (conf %.2f)",
-                decision.provider,
-                decision.action.value,
-                decision.confidence,
+                "Provider %s returned %d/%d decisions", provider.name, len(result), len(missing)
             )
         return decisions
 
+    def _all_providers(self) -> List[ModelProvider]:
+        providers: List[ModelProvider] = list(self.providers.values())
+        if self.anthropic_provider:
+            providers.append(self.anthropic_provider)
+        return providers
+
+    def _available_providers(self) -> List[ModelProvider]:
+        providers = []
+        for provider in self._all_providers():
+            if provider.available:
+                providers.append(provider)
+            else:
+                LOGGER.info("Skipping provider %s: circuit open", provider.name)
+        return providers
+
+    @staticmethod
+    def _ensure_available(provider: ModelProvider) -> None:
+        # A breaker can open mid-cycle, after _available_providers() was checked.
+        # Checking again right before the call keeps it out of the error metrics.
+        if not provider.available:
+            raise ProviderUnavailable(f"Provider {provider.name} circuit is open")
+
+    async def _query_models(
+        self,
+        prompt: str,
+        symbol: Optional[str] = None,
+        snapshot: Optional[dict] = None,
+        timeframe: Optional[str] = None,
+    ) -> List[ModelDecision]:
+        timeframe = timeframe or self.cfg.data.timeframe
+        decisions: List[ModelDecision] = []
+        calls = []
+        for provider in self._available_providers():
+            key = None
+            if self.decision_cache and symbol and snapshot:
+                key = self.decision_cache.key(
+                    provider.name, provider.model, symbol, timeframe, snapshot
+                )
+                cached = self.decision_cache.get(key)
+                if cached:
+                    LOGGER.info(
+                        "Provider %s -> %s (conf %.2f, cached)",
+                        cached.provider,
+                        cached.action.value,
+                        cached.confidence,
+                    )
+                    decisions.append(cached)
+                    continue
+            calls.append((provider, key))
+
+        early_exit = self.cfg.ensemble.early_exit
+        if early_exit and self.ensemble.is_decided(decisions, len(calls)):
+            return decisions
+
+        # Streaming providers report a provisional decision (action and confidence)
+        # before the rest of the reply, so the vote can settle on time-to-first-decision.
+        updates: "asyncio.Queue[tuple]" = asyncio.Queue()
+        tasks = {
+            provider.name: asyncio.ensure_future(self._generate(provider, prompt, key, updates))
+            for provider, key in calls
+        }
+        latest: Dict[str, ModelDecision] = {}
+        running = set(tasks)
+        settled = False
+        try:
+            while running:
+                name, decision, error = await updates.get()
+                if name not in running:
+                    continue
+                if error is not None:
+                    running.discard(name)
+                    # A provisional decision has no stop/take yet and must not outlive its stream.
+                    latest.pop(name, None)
+                    if isinstance(error, ProviderUnavailable):
+                        LOGGER.info("Skipping provider %s: %s", name, error)
+                    else:
+                        LOGGER.error("Provider %s failed: %s", name, error, exc_info=error)
+                else:
+                    latest[name] = decision
+                    if not decision.provisional:
+                        running.discard(name)
+                    LOGGER.info(
+                        "Provider %s -> %s (conf %.2f%s)",
+                        decision.provider,
+                        decision.action.value,
+                        decision.confidence,
+                        ", provisional" if decision.provisional else "",
+                    )
+                if settled or not running or not early_exit:
+                    continue
+                current = decisions + list(latest.values())
+                pending = sum(1 for n in running if n not in latest)
+                if self.ensemble.is_decided(current, pending):
+                    # Only streams backing the winning action are still needed, for their
+                    # stop/take levels; everything else can be cancelled.
+                    settled = True
+                    leader = self.ensemble.leader(current)
+                    keep = {n for n in running if n in latest and latest[n].action == leader}
+                    cancelled = running - keep
+                    LOGGER.info(
+                        "Vote decided early, cancelling %d pending provider calls", len(cancelled)
+                    )
+                    await self._cancel([tasks[n] for n in cancelled])
+                    for n in cancelled:
+                        latest.pop(n, None)
+                    running = keep
+        finally:
+            await self._cancel(list(tasks.values()))
+        return decisions + [d for d in latest.values() if not d.provisional]
+
+    @staticmethod
+    async def _cancel(tasks: List["asyncio.Future[None]"]) -> None:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _generate(
+        self,
+        provider: ModelProvider,
+        prompt: str,
+        cache_key: Optional[str],
+        updates: "asyncio.Queue[tuple]",
+    ) -> None:
+        try:
+            self._ensure_available(provider)
+            with PROVIDER_SECONDS.time(PROVIDER_ERRORS, provider=provider.name):
+                async for decision in provider.generate_stream(prompt):
+                    if not decision.provisional and cache_key and self.decision_cache:
+                        self.decision_cache.put(cache_key, decision)
+                    updates.put_nowait((provider.name, decision, None))
+        except Exception as exc:  # pylint: disable=broad-except
+            updates.put_nowait((provider.name, None, exc))
+
+    def reconfigure(self, cfg: Config) -> None:
+        """Apply a reloaded config to the ensemble, gate, market data and risk settings.
+
+        Providers, the exchange, the HTTP pool and the decision cache keep the
+        settings they were built with until the engine is recreated.
+        """
+        self.cfg = cfg
+        self.ensemble = Ensemble(cfg.ensemble)
+        self.gate.cfg = cfg.gate
+        self.market_data.cfg = cfg
+        self.execution.cfg = cfg
+        self.execution.risk_manager.cfg = cfg.risk
+        if self.execution.balances is not None:
+            self.execution.balances.cfg = cfg.balance
+        if self.execution.orders is not None:
+            self.execution.orders.cfg = cfg.orders
+        if self.prices is not None:
+            self.prices.cfg = cfg.prices
+        LOGGER.info("Engine reconfigured")
+
+    async def warmup(self) -> None:
+        started = asyncio.get_running_loop().time()
+        await asyncio.gather(*(provider.warmup() for provider in self._all_providers()))
+        LOGGER.info(
+            "Pre-warmed provider connections in %.2fs", asyncio.get_running_loop().time() - started
+        )
+
+    async def aclose(self) -> None:
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        for provider in self._all_providers():
+            try:
+                await provider.aclose()
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to close provider %s: %s", provider.name, exc)
+        if self.http_pool is not None:
+            await self.http_pool.aclose()
+        if self.prices is not None:
+            await self.prices.stop()
+        await self.execution.aclose()
+        await self.market_data.exchange.close()
+        if self.decision_cache:
+            self.decision_cache.close()
+
     @classmethod
     def from_env(cls, cfg: Optional[Config] = None, paper: bool = True):
         cfg = cfg or Config.load(DEFAULT_CONFIG_PATH)
@@ -83,46 +394,95 @@ class TradingEngine:
         exchange = cls._init_exchange(cfg, paper)
         market_data = MarketDataClient(cfg, exchange)
         execution_client = ExecutionFactory.create(cfg, exchange, paper)
-        providers: Dict[str, OpenAICompatibleProvider] = {}
+        http_pool = HttpPool(cfg.http)
+        providers: Dict[str, ModelProvider] = {}
 
         openai_cfg = cfg.providers.get("openai")
         if openai_cfg and openai_cfg.enabled and os.getenv("OPENAI_API_KEY"):
-            providers["openai"] = OpenAIProvider(
-                model=openai_cfg.model or "gpt-4o-mini",
-                temperature=openai_cfg.temperature,
-                top_p=openai_cfg.top_p,
-                max_tokens=openai_cfg.max_tokens,
-                timeout=openai_cfg.timeout,
+            providers["openai"] = ResilientProvider(
+                OpenAIProvider(
+                    model=openai_cfg.model or "gpt-4o-mini",
+                    temperature=openai_cfg.temperature,
+                    top_p=openai_cfg.top_p,
+                    max_tokens=openai_cfg.max_tokens,
+                    max_output_tokens=openai_cfg.max_output_tokens,
+                    timeout=openai_cfg.timeout,
+                    client=http_pool.client(),
+                    stream=openai_cfg.stream,
+                ),
+                openai_cfg.policy,
             )
 
         grok_cfg = cfg.providers.get("grok")
         grok_base = os.getenv("GROK_BASE_URL")
         grok_key = os.getenv("GROK_API_KEY")
         if grok_cfg and grok_cfg.enabled and grok_base and grok_key:
-            providers["grok"] = GrokProvider(
-                model=grok_cfg.model or "grok-latest",
-                base_url=grok_base,
-                api_key=grok_key,
-                temperature=grok_cfg.temperature,
-                top_p=grok_cfg.top_p,
-                max_tokens=grok_cfg.max_tokens,
-                timeout=grok_cfg.timeout,
+            providers["grok"] = ResilientProvider(
+                GrokProvider(
+                    model=grok_cfg.model or "grok-latest",
+                    base_url=grok_base,
+                    api_key=grok_key,
+                    temperature=grok_cfg.temperature,
+                    top_p=grok_cfg.top_p,
+                    max_tokens=grok_cfg.max_tokens,
+                    max_output_tokens=grok_cfg.max_output_tokens,
+                    timeout=grok_cfg.timeout,
+                    client=http_pool.client(),
+                    stream=grok_cfg.stream,
+                ),
+                grok_cfg.policy,
             )
 
         anthropic_provider = None
         anthropic_cfg = cfg.providers.get("anthropic")
         if anthropic_cfg and anthropic_cfg.enabled and os.getenv("ANTHROPIC_API_KEY"):
-            anthropic_provider = AnthropicProvider(
-                model=anthropic_cfg.model or "claude-3-5-sonnet-20240620",
-                temperature=anthropic_cfg.temperature,
-                max_tokens=anthropic_cfg.max_tokens,
+            anthropic_provider = ResilientProvider(
+                AnthropicProvider(
+                    model=anthropic_cfg.model or "claude-3-5-sonnet-20240620",
+                    temperature=anthropic_cfg.temperature,
+                    max_tokens=anthropic_cfg.max_tokens,
+                    max_output_tokens=anthropic_cfg.max_output_tokens,
+                    timeout=anthropic_cfg.timeout,
+                    http_pool=http_pool,
+                    stream=anthropic_cfg.stream,
+                    prompt_cache=cfg.prompt.cache_prefix,
+                ),
+                anthropic_cfg.policy,
             )
 
-        return cls(cfg, providers, anthropic_provider, market_data, execution_client)
+        prices = None
+        if cfg.prices.enabled:
+            symbols = set(cfg.symbols)
+            for scheduled in cfg.schedule.timeframes.values():
+                symbols.update(scheduled or ())
+            prices = PriceCache(cfg.prices, exchange, symbols)
+        engine = cls(
+            cfg,
+            providers,
+            anthropic_provider,
+            market_data,
+            execution_client,
+            http_pool=http_pool,
+            prices=prices,
+        )
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            LOGGER.debug(
+                "No running event loop; call TradingEngine.warmup() to pre-warm and "
+                "prices.start() and execution.start() to poll tickers, balances and orders"
+            )
+        else:
+            if cfg.http.prewarm:
+                engine._warmup_task = loop.create_task(engine.warmup())
+            if prices is not None:
+                prices.start()
+            execution_client.start()
+        return engine
 
     @staticmethod
-    def _init_exchange(cfg: Config, paper: bool) -> ccxt.Exchange:
-        exchange_class = getattr(ccxt, cfg.exchange.name)
+    def _init_exchange(cfg: Config, paper: bool) -> AsyncExchange:
+        exchange_class = getattr(exchange_module(cfg.exchange.backend), cfg.exchange.name)
         params = cfg.exchange.params.copy()
         if paper and cfg.exchange.testnet:
             params.setdefault("options", {}).update({"defaultType": "swap"})
@@ -134,12 +494,12 @@ class TradingEngine:
             exchange.secret = api_secret
         if cfg.exchange.testnet:
             exchange.set_sandbox_mode(True)
-        return exchange
+        return wrap_exchange(exchange, cfg.exchange.backend, max_workers=cfg.exchange.max_workers)
 
 
 class ExecutionFactory:
     @staticmethod
-    def create(cfg: Config, exchange: ccxt.Exchange, paper: bool):
+    def create(cfg: Config, exchange: AsyncExchange, paper: bool):
         from .execution import ExecutionClient  # Local import to avoid circular dependency
 
         return ExecutionClient(cfg, exchange, paper=paper)
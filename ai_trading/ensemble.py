@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from collections import Counter
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional
 
 from .config import EnsembleConfig
 from .types import ModelDecision, TradeAction
@@ -14,6 +14,24 @@ class Ensemble:
     def __init__(self, cfg: EnsembleConfig) -> None:
         self.cfg = cfg
 
+    def is_decided(self, decisions: Iterable[ModelDecision], pending: int) -> bool:
+        actionable = [d for d in decisions if d.is_actionable(self.cfg.min_confidence)]
+        ranked = Counter(d.action for d in actionable).most_common()
+        leader = ranked[0][1] if ranked else 0
+        if leader + pending < self.cfg.require_agreement:
+            return True
+        if leader >= self.cfg.require_agreement:
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0
+            return runner_up + pending < leader
+        return False
+
+    def leader(self, decisions: Iterable[ModelDecision]) -> Optional[TradeAction]:
+        actionable = [d for d in decisions if d.is_actionable(self.cfg.min_confidence)]
+        ranked = Counter(d.action for d in actionable).most_common(1)
+        if ranked and ranked[0][1] >= self.cfg.require_agreement:
+            return ranked[0][0]
+        return None
+
     def vote(self, decisions: Iterable[ModelDecision]) -> ModelDecision | None:
         actionable = [d for d in decisions if d.is_actionable(self.cfg.min_confidence)]
         if not actionable:
@@ -48,4 +66,20 @@ class Ensemble:
             take_pct=avg_take,
             reason=reason,
             provider="ensemble",
+            symbol=subset[0].symbol,
         )
+
+    def vote_by_symbol(self, decisions: Iterable[ModelDecision]) -> Dict[str, ModelDecision]:
+        grouped: Dict[str, List[ModelDecision]] = {}
+        for decision in decisions:
+            if decision.symbol is None:
+                LOGGER.warning("Ignoring decision without symbol from %s", decision.provider)
+                continue
+            grouped.setdefault(decision.symbol, []).append(decision)
+        results: Dict[str, ModelDecision] = {}
+        for symbol, symbol_decisions in grouped.items():
+            LOGGER.info("Voting on %s", symbol)
+            consensus = self.vote(symbol_decisions)
+            if consensus:
+                results[symbol] = consensus
+        return results
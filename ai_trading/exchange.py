@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import ccxt
+import ccxt.async_support as ccxt_async
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncExchange(abc.ABC):
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    @abc.abstractmethod
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[List[float]]:
+        return await self.call("fetch_ohlcv", symbol, timeframe=timeframe, since=since, limit=limit)
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        return await self.call("fetch_ticker", symbol)
+
+    async def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        return await self.call("fetch_tickers", symbols)
+
+    async def fetch_balance(self) -> Dict[str, Any]:
+        return await self.call("fetch_balance")
+
+    async def create_market_order(self, symbol: str, side: str, amount: float) -> Dict[str, Any]:
+        return await self.call("create_market_order", symbol, side, amount)
+
+    async def fetch_orders(self, symbol: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await self.call("fetch_orders", symbol, since=since)
+
+    async def fetch_open_orders(
+        self, symbol: str, since: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return await self.call("fetch_open_orders", symbol, since=since)
+
+    async def fetch_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        return await self.call("fetch_order", order_id, symbol)
+
+    async def close(self) -> None:
+        return None
+
+
+class ThreadPoolExchange(AsyncExchange):
+    def __init__(self, client: ccxt.Exchange, max_workers: int = 4) -> None:
+        super().__init__(client)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="ccxt"
+        )
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        func = functools.partial(getattr(self.client, method), *args, **kwargs)
+        return await loop.run_in_executor(self._executor, func)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class CcxtAsyncExchange(AsyncExchange):
+    def __init__(self, client: ccxt_async.Exchange) -> None:
+        super().__init__(client)
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return await getattr(self.client, method)(*args, **kwargs)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+EXCHANGE_BACKENDS = {"async", "thread"}
+
+
+def exchange_module(backend: str):
+    if backend == "async":
+        return ccxt_async
+    if backend == "thread":
+        return ccxt
+    raise ValueError(f"Unknown exchange backend {backend!r}; expected one of {sorted(EXCHANGE_BACKENDS)}")
+
+
+def wrap_exchange(client: Any, backend: str, max_workers: int = 4) -> AsyncExchange:
+    if backend == "async":
+        return CcxtAsyncExchange(client)
+    if backend == "thread":
+        return ThreadPoolExchange(client, max_workers=max_workers)
+    raise ValueError(f"Unknown exchange backend {backend!r}; expected one of {sorted(EXCHANGE_BACKENDS)}")
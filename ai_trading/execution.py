@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, Optional
-
-import ccxt
+from typing import Dict, Optional, Tuple
 
+from .balances import BalanceCache, split_symbol
 from .config import Config
+from .exchange import AsyncExchange
+from .metrics import ORDERS
+from .orders import UNFILLED_STATUSES, Fill, OrderManager, TrackedOrder
 from .risk import RiskManager
 from .types import OrderResult, Position, TradeAction
 
@@ -62,22 +64,111 @@ class PaperAccount:
         )
 
 
+@dataclass
+class LivePosition:
+    """Net exposure built from live fills; ``size`` is negative for a short."""
+
+    symbol: str
+    size: float = 0.0
+    entry_price: float = 0.0
+    # Daily risk reserved for the open size, released as it is closed.
+    reserved: float = 0.0
+
+    def apply(self, amount: float, price: float) -> Tuple[float, float]:
+        """Add a signed fill; returns the amount it closed and the realised PnL."""
+        closed = pnl = 0.0
+        if self.size and (self.size > 0) != (amount > 0):
+            closed = min(abs(amount), abs(self.size))
+            direction = 1 if self.size > 0 else -1
+            pnl = (price - self.entry_price) * closed * direction
+            self.size -= direction * closed
+            amount += direction * closed
+        if amount:
+            # Whatever is left adds to (or, after a full close, reopens) the position.
+            total = self.size + amount
+            self.entry_price = (self.entry_price * self.size + price * amount) / total
+            self.size = total
+        return closed, pnl
+
+
 class ExecutionClient:
-    def __init__(self, cfg: Config, exchange: ccxt.Exchange, paper: bool = True) -> None:
+    def __init__(self, cfg: Config, exchange: AsyncExchange, paper: bool = True) -> None:
         self.cfg = cfg
         self.exchange = exchange
         self.paper = paper
         self.paper_account = PaperAccount() if paper else None
         self.risk_manager = RiskManager(cfg.risk)
+        self.balances = None if paper else BalanceCache(cfg.balance, exchange)
+        self.orders = None if paper else OrderManager(cfg.orders, exchange)
+        self.positions: Dict[str, LivePosition] = {}
+        self._reserved: Dict[str, float] = {}
+        self._closing: Dict[str, str] = {}
+        if self.orders is not None:
+            self.orders.add_listener(self._on_fill)
+            self.orders.add_done_listener(self._on_order_done)
+
+    async def position_size(self, symbol: str, price: float) -> float:
+        return self._notional(symbol, await self.account_balance(symbol))
+
+    async def account_balance(self, symbol: Optional[str] = None) -> float:
+        if self.paper:
+            return self.paper_account.available_balance()
+        _, quote = split_symbol(symbol or self.cfg.symbols[0])
+        return await self.balances.get(quote)
+
+    def start(self) -> None:
+        if self.balances is not None:
+            self.balances.start()
+        if self.orders is not None:
+            self.orders.start()
+
+    async def aclose(self) -> None:
+        if self.balances is not None:
+            await self.balances.stop()
+        if self.orders is not None:
+            await self.orders.stop()
+
+    def _on_fill(self, fill: Fill) -> None:
+        self.balances.apply_fill(
+            fill.symbol, fill.side, fill.amount, fill.price, fill.timestamp
+        )
+        position = self.positions.setdefault(fill.symbol, LivePosition(fill.symbol))
+        held = abs(position.size)
+        closed, pnl = position.apply(
+            fill.amount if fill.side == "buy" else -fill.amount, fill.price
+        )
+        if closed:
+            # The risk reserved when this exposure was opened is settled by its PnL.
+            released = position.reserved * closed / held
+            position.reserved -= released
+            self.risk_manager.release_risk(released)
+            if pnl >= 0:
+                self.risk_manager.register_profit(pnl)
+            else:
+                self.risk_manager.register_loss(pnl)
+        opened = fill.amount - closed
+        if opened > 0:
+            # execute() reserved the order's notional, i.e. its amount at the sizing price.
+            position.reserved += opened * (fill.reference_price or fill.price)
+        if not position.size:
+            del self.positions[fill.symbol]
 
-    def position_size(self, symbol: str, price: float) -> float:
-        risk_per_trade = self.cfg.risk.risk_per_trade
-        balance = self.paper_account.available_balance() if self.paper else self._balance()
-        notional = balance * risk_per_trade
+    def _on_order_done(self, order: TrackedOrder) -> None:
+        if self._closing.get(order.symbol) == order.id:
+            del self._closing[order.symbol]
+        notional = self._reserved.pop(order.id, None)
+        if notional is None or order.status not in UNFILLED_STATUSES:
+            return
+        if order.amount > 0 and order.filled < order.amount:
+            # Only the filled part of a canceled or rejected order carries risk.
+            self.risk_manager.release_risk(notional * (1 - order.filled / order.amount))
+
+    def _notional(self, symbol: str, balance: float) -> float:
+        notional = balance * self.cfg.risk.risk_per_trade
         LOGGER.debug("Risking %.2f on %s (balance %.2f)", notional, symbol, balance)
         return notional
 
-    def execute(
+    async def execute(
         self,
         symbol: str,
         decision: TradeAction,
@@ -86,36 +177,68 @@ class ExecutionClient:
         take_pct: float,
     ) -> Optional[OrderResult]:
         self.risk_manager.reset_if_new_day()
-        if self.risk_manager.check_kill_switch():
-            LOGGER.error("Kill switch active. No trades will be executed.")
-            return None
         if decision == TradeAction.NONE:
             LOGGER.info("Decision is HOLD. No trade executed.")
             return None
-        notional = self.position_size(symbol, price if price else 1.0)
-        if not self.risk_manager.allow_trade(notional):
+        position = self.positions.get(symbol)
+        if position is not None and (position.size > 0) != (decision == TradeAction.BUY):
+            return await self._close(position, decision, price)
+        balance = await self.account_balance(symbol)
+        if self.risk_manager.check_kill_switch(balance):
+            LOGGER.error("Kill switch active. No trades will be executed.")
+            return None
+        notional = self._notional(symbol, balance)
+        if not self.risk_manager.allow_trade(notional, balance):
             return None
         self.risk_manager.reserve_risk(notional)
         if self.paper:
             trade_price = price if price and price > 0 else 1.0
-            return self.paper_account.open_position(
+            result = self.paper_account.open_position(
                 symbol, decision, notional, trade_price, stop_pct, take_pct
             )
+        else:
+            side = "buy" if decision == TradeAction.BUY else "sell"
+            amount = notional / price
+            LOGGER.info("Placing order: %s %s amount %.6f", side, symbol, amount)
+            try:
+                order = await self.orders.submit(symbol, side, amount, price)
+            except Exception:
+                self.risk_manager.release_risk(notional)
+                raise
+            self._reserved[order.id] = notional
+            if order.final:
+                self._on_order_done(order)
+            result = OrderResult(
+                symbol=symbol,
+                side=decision,
+                size=amount,
+                price=order.average or price,
+                status=order.status,
+                order_id=order.id,
+            )
+        ORDERS.inc(symbol=symbol, side=result.side.value, status=result.status or "unknown")
+        return result
+
+    async def _close(
+        self, position: LivePosition, decision: TradeAction, price: float
+    ) -> Optional[OrderResult]:
+        # Closing reduces exposure, so it reserves no risk and ignores the kill switch.
+        if position.symbol in self._closing:
+            LOGGER.info("Close order for %s still open. No trade executed.", position.symbol)
+            return None
         side = "buy" if decision == TradeAction.BUY else "sell"
-        amount = notional / price
-        LOGGER.info("Placing order: %s %s amount %.6f", side, symbol, amount)
-        order = self.exchange.create_market_order(symbol, side, amount)
-        return OrderResult(
-            symbol=symbol,
+        amount = abs(position.size)
+        LOGGER.info("Closing %s position: %s amount %.6f", position.symbol, side, amount)
+        order = await self.orders.submit(position.symbol, side, amount, price)
+        if not order.final:
+            self._closing[position.symbol] = order.id
+        result = OrderResult(
+            symbol=position.symbol,
             side=decision,
             size=amount,
-            price=price,
-            status=order.get("status", "unknown"),
-            order_id=order.get("id"),
+            price=order.average or price,
+            status=order.status,
+            order_id=order.id,
         )
-
-    def _balance(self) -> float:
-        balance = self.exchange.fetch_balance()
-        quote = self.cfg.symbols[0].split("/")[1]
-        total = balance["total"].get(quote, 0.0)
-        return float(total)
+        ORDERS.inc(symbol=position.symbol, side=decision.value, status=order.status or "unknown")
+        return result
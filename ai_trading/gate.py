@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import GateConfig
+from .metrics import GATE_DECISIONS
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ChangeGate:
+    def __init__(self, cfg: GateConfig, clock: Callable[[], float] = time.monotonic) -> None:
+        self.cfg = cfg
+        self.clock = clock
+        self.passed = 0
+        self.skipped = 0
+        self._baselines: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+
+    def should_query(self, symbol: str, timeframe: str, snapshot: dict) -> bool:
+        if not self.cfg.enabled:
+            return True
+        reason = self._change_reason(self._baselines.get((symbol, timeframe)), snapshot)
+        if reason is None:
+            self.skipped += 1
+            GATE_DECISIONS.inc(result="skipped")
+            LOGGER.info("Gate: %s %s unchanged, skipping model query", symbol, timeframe)
+            return False
+        self.passed += 1
+        GATE_DECISIONS.inc(result="passed")
+        LOGGER.debug("Gate: querying models for %s %s (%s)", symbol, timeframe, reason)
+        return True
+
+    def record(self, symbol: str, timeframe: str, snapshot: dict) -> None:
+        if self.cfg.enabled:
+            self._baselines[(symbol, timeframe)] = (self.clock(), dict(snapshot))
+
+    def stats(self) -> Dict[str, int]:
+        return {"passed": self.passed, "skipped": self.skipped}
+
+    def _change_reason(self, baseline: Optional[Tuple[float, dict]], snapshot: dict) -> Optional[str]:
+        if baseline is None:
+            return "no baseline"
+        recorded_at, previous = baseline
+        if self.cfg.max_age_seconds and self.clock() - recorded_at >= self.cfg.max_age_seconds:
+            return "baseline expired"
+        if snapshot.get("candle_time") != previous.get("candle_time"):
+            return "new candle"
+        if previous["close"] and abs(snapshot["close"] / previous["close"] - 1) * 1e4 >= self.cfg.price_bps:
+            return "price moved"
+        if _moved(previous.get("rsi"), snapshot.get("rsi"), self.cfg.rsi_delta):
+            return "rsi moved"
+        if _moved(previous.get("momentum_5"), snapshot.get("momentum_5"), self.cfg.momentum_delta):
+            return "momentum moved"
+        return None
+
+
+def _moved(previous: Optional[float], current: Optional[float], threshold: float) -> bool:
+    if previous is None or current is None:
+        return previous is not current
+    if not (math.isfinite(previous) and math.isfinite(current)):
+        return math.isfinite(previous) != math.isfinite(current)
+    return abs(current - previous) >= threshold
@@ -0,0 +1,23 @@
+"""Indicator implementations used to build market snapshots."""
+
+from .batch import batch_features
+from .kernels import INDICATORS, indicator_series, latest_indicators
+from .streaming import (
+    IndicatorState,
+    StreamingIndicator,
+    StreamingMomentum,
+    StreamingRSI,
+    default_indicators,
+)
+
+__all__ = [
+    "INDICATORS",
+    "IndicatorState",
+    "StreamingIndicator",
+    "StreamingMomentum",
+    "StreamingRSI",
+    "batch_features",
+    "default_indicators",
+    "indicator_series",
+    "latest_indicators",
+]
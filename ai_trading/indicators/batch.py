@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from .kernels import latest_indicators
+
+CLOSE = 4
+
+
+def sma_rsi_last(close: np.ndarray, period: int = 14) -> np.ndarray:
+    # Last-bar value of MarketDataClient._compute_rsi for every row of ``close``.
+    if close.shape[-1] <= period:
+        return np.full(close.shape[:-1], 50.0)
+    delta = np.diff(close[..., -(period + 1) :], axis=-1)
+    avg_gain = np.clip(delta, 0, None).mean(axis=-1)
+    avg_loss = np.clip(-delta, 0, None).mean(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 50.0, rsi)
+
+
+def momentum_last(close: np.ndarray, period: int = 5) -> np.ndarray:
+    if close.shape[-1] <= period:
+        return np.full(close.shape[:-1], np.nan)
+    return close[..., -1] / close[..., -(period + 1)] - 1
+
+
+def batch_features(
+    candles: np.ndarray, names: Iterable[str] = ()
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Base and extra last-bar features for candles stacked as (symbols, bars, 6)."""
+    close = candles[..., CLOSE]
+    base = {"rsi": sma_rsi_last(close, 14), "momentum_5": momentum_last(close, 5)}
+    return base, latest_indicators(candles, names)
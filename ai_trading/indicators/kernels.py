@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Iterable, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# All kernels take raw float arrays and work along the last axis, so a single
+# series (bars,) and a stacked universe (symbols, bars) go through the same code.
+
+_EWM_TOLERANCE = 1e-16
+
+
+def _causal_filter(x: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    n = x.shape[-1]
+    size = 1 << (n + len(kernel) - 2).bit_length()
+    spectrum = np.fft.rfft(x, size, axis=-1) * np.fft.rfft(kernel, size)
+    return np.fft.irfft(spectrum, size, axis=-1)[..., :n]
+
+
+def _pad_front(values: np.ndarray, n: int) -> np.ndarray:
+    missing = n - values.shape[-1]
+    if missing <= 0:
+        return values
+    pad = np.full(values.shape[:-1] + (missing,), np.nan)
+    return np.concatenate([pad, values], axis=-1)
+
+
+def _mask_warmup(values: np.ndarray, periods: int) -> np.ndarray:
+    if periods > 0:
+        values[..., :periods] = np.nan
+    return values
+
+
+def ewm_mean(x: np.ndarray, alpha: float, adjust: bool = True) -> np.ndarray:
+    """Exponentially weighted mean matching ``pandas.Series.ewm(alpha=...).mean()``."""
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    if n == 0:
+        return x.copy()
+    decay = 1.0 - alpha
+    length = n if decay <= 0 else min(n, math.ceil(math.log(_EWM_TOLERANCE) / math.log(decay)) + 1)
+    weights = decay ** np.arange(length)
+    # Both weightings sum to one, so filtering around the first value keeps
+    # FFT round-off relative to price moves rather than price levels.
+    base = x[..., :1]
+    shifted = x - base
+    if not adjust:
+        return _causal_filter(shifted, alpha * weights) + base
+    norm = np.cumsum(weights)
+    if length < n:
+        norm = np.concatenate([norm, np.full(n - length, norm[-1])])
+    return _causal_filter(shifted, weights) / norm + base
+
+
+def ema(close: np.ndarray, span: int) -> np.ndarray:
+    return ewm_mean(close, alpha=2.0 / (span + 1), adjust=False)
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    if x.shape[-1] < window:
+        return np.full(x.shape, np.nan)
+    return _pad_front(sliding_window_view(x, window, axis=-1).mean(axis=-1), x.shape[-1])
+
+
+def wilder_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    close = np.asarray(close, dtype=float)
+    n = close.shape[-1]
+    if n < 2:
+        return np.full(close.shape, np.nan)
+    delta = np.diff(close, axis=-1)
+    avg_gain = ewm_mean(np.clip(delta, 0, None), alpha=1.0 / period, adjust=False)
+    avg_loss = ewm_mean(np.clip(-delta, 0, None), alpha=1.0 / period, adjust=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), rsi)
+    return _mask_warmup(_pad_front(rsi, n), period)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    ranges = np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
+    ranges[..., 0] = 0.0
+    return np.maximum(high - low, ranges)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    tr = true_range(high, low, close)
+    return _mask_warmup(ewm_mean(tr, alpha=1.0 / period, adjust=False), period - 1)
+
+
+def bollinger_width(close: np.ndarray, period: int = 20, num_std: float = 2.0) -> np.ndarray:
+    close = np.asarray(close, dtype=float)
+    if close.shape[-1] < period:
+        return np.full(close.shape, np.nan)
+    windows = sliding_window_view(close, period, axis=-1)
+    width = 2 * num_std * windows.std(axis=-1) / windows.mean(axis=-1)
+    return _pad_front(width, close.shape[-1])
+
+
+def vwap(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    window: int = 20,
+) -> np.ndarray:
+    volume = np.asarray(volume, dtype=float)
+    if volume.shape[-1] < window:
+        return np.full(volume.shape, np.nan)
+    typical = (np.asarray(high, float) + np.asarray(low, float) + np.asarray(close, float)) / 3
+    price_volume = sliding_window_view(typical * volume, window, axis=-1).sum(axis=-1)
+    total_volume = sliding_window_view(volume, window, axis=-1).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = price_volume / total_volume
+    return _pad_front(values, volume.shape[-1])
+
+
+def macd(
+    close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+INDICATORS: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {
+    "ema": lambda o, h, l, c, v: {"ema_21": ema(c, 21)},
+    "atr": lambda o, h, l, c, v: {"atr_14": atr(h, l, c, 14)},
+    "bollinger": lambda o, h, l, c, v: {"bb_width_20": bollinger_width(c, 20, 2.0)},
+    "vwap": lambda o, h, l, c, v: {"vwap_20": vwap(h, l, c, v, 20)},
+    "macd": lambda o, h, l, c, v: dict(zip(("macd", "macd_signal", "macd_hist"), macd(c))),
+    "rsi_wilder": lambda o, h, l, c, v: {"rsi_wilder_14": wilder_rsi(c, 14)},
+}
+
+
+def indicator_series(candles: np.ndarray, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Full series of the named indicators for ``candles`` shaped (..., bars, 6)."""
+    fields = tuple(candles[..., i] for i in range(1, 6))
+    values: Dict[str, np.ndarray] = {}
+    for name in names:
+        try:
+            kernel = INDICATORS[name]
+        except KeyError as exc:
+            raise ValueError(f"Unknown indicator {name!r}; expected one of {sorted(INDICATORS)}") from exc
+        values.update(kernel(*fields))
+    return values
+
+
+def latest_indicators(candles: np.ndarray, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Last-bar values of the named indicators for ``candles`` shaped (..., bars, 6)."""
+    return {key: series[..., -1] for key, series in indicator_series(candles, names).items()}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import abc
+import math
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+CLOSE = 4
+
+
+class StreamingIndicator(abc.ABC):
+    @abc.abstractmethod
+    def push(self, candle: np.ndarray) -> None:
+        """Commit a closed candle to the indicator state."""
+
+    @abc.abstractmethod
+    def preview(self, candle: np.ndarray) -> float:
+        """Value the indicator would have if ``candle`` closed now, without committing it."""
+
+    @abc.abstractmethod
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class StreamingRSI(StreamingIndicator):
+    # Simple-average RSI matching MarketDataClient._compute_rsi on the last row.
+    # Window sums are kept running so push and preview are O(1); the count of
+    # non-zero losses tells an all-gain window apart from float residue.
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        self._prev_close: Optional[float] = None
+        self._gains: Deque[float] = deque(maxlen=self.period)
+        self._losses: Deque[float] = deque(maxlen=self.period)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._loss_count = 0
+
+    def push(self, candle: np.ndarray) -> None:
+        close = float(candle[CLOSE])
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            if len(self._gains) == self.period:
+                self._gain_sum -= self._gains[0]
+                self._loss_sum -= self._losses[0]
+                self._loss_count -= self._losses[0] > 0
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self._gains.append(gain)
+            self._losses.append(loss)
+            self._gain_sum += gain
+            self._loss_sum += loss
+            self._loss_count += loss > 0
+            if not self._loss_count:
+                self._loss_sum = 0.0
+        self._prev_close = close
+
+    def preview(self, candle: np.ndarray) -> float:
+        if self._prev_close is None:
+            return 50.0
+        delta = float(candle[CLOSE]) - self._prev_close
+        full = len(self._gains) == self.period
+        if len(self._gains) + 1 < self.period:
+            return 50.0
+        evicted_gain = self._gains[0] if full else 0.0
+        evicted_loss = self._losses[0] if full else 0.0
+        losses = self._loss_count - (evicted_loss > 0) + (delta < 0)
+        if not losses:
+            return 50.0
+        gain_sum = max(self._gain_sum - evicted_gain + max(delta, 0.0), 0.0)
+        loss_sum = self._loss_sum - evicted_loss + max(-delta, 0.0)
+        rs = gain_sum / loss_sum
+        return 100 - (100 / (1 + rs))
+
+
+class StreamingMomentum(StreamingIndicator):
+    def __init__(self, period: int = 5) -> None:
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        self._closes: Deque[float] = deque(maxlen=self.period)
+
+    def push(self, candle: np.ndarray) -> None:
+        self._closes.append(float(candle[CLOSE]))
+
+    def preview(self, candle: np.ndarray) -> float:
+        if len(self._closes) < self.period:
+            return math.nan
+        return float(candle[CLOSE]) / self._closes[0] - 1
+
+
+def default_indicators() -> Dict[str, StreamingIndicator]:
+    return {"rsi": StreamingRSI(period=14), "momentum_5": StreamingMomentum(period=5)}
+
+
+class IndicatorState:
+    """Per-symbol indicator state fed from a candle buffer.
+
+    All rows but the last are treated as closed and pushed once; the last row is
+    the still-forming bar and is only previewed.
+    """
+
+    def __init__(self, indicators: Dict[str, StreamingIndicator]) -> None:
+        self.indicators = indicators
+        self.committed_ts: Optional[int] = None
+
+    def reset(self) -> None:
+        self.committed_ts = None
+        for indicator in self.indicators.values():
+            indicator.reset()
+
+    def update(self, candles: np.ndarray) -> Dict[str, float]:
+        if not len(candles):
+            raise ValueError("No market data available")
+        closed = candles[:-1]
+        start = 0
+        if self.committed_ts is not None:
+            start = int(np.searchsorted(closed[:, 0], self.committed_ts, side="right"))
+            if start == 0 or int(closed[start - 1, 0]) != self.committed_ts:
+                self.reset()
+                start = 0
+        for row in closed[start:]:
+            for indicator in self.indicators.values():
+                indicator.push(row)
+        if len(closed):
+            self.committed_ts = int(closed[-1, 0])
+        forming = candles[-1]
+        return {name: indicator.preview(forming) for name, indicator in self.indicators.items()}
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labels, key)} {_format_value(v)}" for key, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum.
+        self._series: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    @contextmanager
+    def time(self, errors: Optional[Counter] = None, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block; failures also increment ``errors``."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            if errors is not None:
+                errors.inc(**labels)
+            self.observe(time.perf_counter() - started, **labels)
+            raise
+        # Cancelled blocks (early exit, shutdown) are left out so they do not
+        # drag the latency distribution down.
+        self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, (list(counts), total)) for key, (counts, total) in self._series.items()
+            )
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_label_text(self.labels, key, le)} {cumulative}"
+                )
+            labels = _label_text(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "aitrading_stage_seconds",
+    "Latency of pipeline stages (fetch_ohlcv, features, vote, execute) per symbol.",
+    ("stage", "symbol"),
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "aitrading_stage_errors_total", "Failed pipeline stages per symbol.", ("stage", "symbol")
+)
+CYCLE_SECONDS = REGISTRY.histogram(
+    "aitrading_cycle_seconds", "Duration of a full engine cycle.", ("timeframe",)
+)
+PROVIDER_SECONDS = REGISTRY.histogram(
+    "aitrading_provider_seconds", "Latency of model provider requests.", ("provider",)
+)
+PROVIDER_ERRORS = REGISTRY.counter(
+    "aitrading_provider_errors_total", "Failed model provider requests.", ("provider",)
+)
+PROVIDER_TOKENS = REGISTRY.counter(
+    "aitrading_provider_tokens_total",
+    "Tokens reported by model providers (prompt, cached, cache_write, completion).",
+    ("provider", "kind"),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "aitrading_decision_cache_requests_total", "Decision cache lookups.", ("result",)
+)
+PRICE_REQUESTS = REGISTRY.counter(
+    "aitrading_price_cache_requests_total",
+    "Price lookups served from the ticker cache (hit) or a single-ticker fetch (fallback).",
+    ("result",),
+)
+GATE_DECISIONS = REGISTRY.counter(
+    "aitrading_gate_decisions_total", "Change gate outcomes.", ("result",)
+)
+ORDERS = REGISTRY.counter(
+    "aitrading_orders_total", "Orders submitted per symbol.", ("symbol", "side", "status")
+)
+
+
+async def _serve(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, registry: MetricsRegistry
+) -> None:
+    try:
+        request = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, content_type, body = "200 OK", CONTENT_TYPE, registry.render().encode()
+        else:
+            status, content_type, body = "404 Not Found", "text/plain", b"Not Found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except Exception as exc:  # pylint: disable=broad-except
+        LOGGER.debug("Metrics request failed: %s", exc)
+    finally:
+        writer.close()
+
+
+async def start_exporter(
+    host: str = "0.0.0.0", port: int = 9108, registry: MetricsRegistry = REGISTRY
+) -> asyncio.AbstractServer:
+    """Serve ``/metrics`` for processes without the webhook app (e.g. ``main.py``)."""
+    server = await asyncio.start_server(lambda r, w: _serve(r, w, registry), host, port)
+    LOGGER.info("Serving metrics on http://%s:%d/metrics", host, port)
+    return server
@@ -1,11 +1,16 @@
 """Model provider exports."""
 
 from .anthropic_provider import AnthropicProvider
+from .base import ModelProvider
 from .openai_provider import GrokProvider, OpenAICompatibleProvider, OpenAIProvider
+from .resilience import ProviderUnavailable, ResilientProvider
 
 __all__ = [
     "AnthropicProvider",
     "GrokProvider",
+    "ModelProvider",
     "OpenAICompatibleProvider",
     "OpenAIProvider",
+    "ProviderUnavailable",
+    "ResilientProvider",
 ]
@@ -1,36 +1,90 @@
 from __future__ import annotations
 
-import json
 import os
+from typing import Any, AsyncIterator, Dict, Optional
 
 import anthropic
 
-from ..types import ModelDecision
+from ..strategy import SYSTEM_PROMPT
+from ..types import TokenUsage
 from .base import ModelProvider
+from .http import HttpPool, prewarm
 
 
 class AnthropicProvider(ModelProvider):
-    def __init__(self, model: str, temperature: float = 0.2, max_tokens: int = 512) -> None:
+    def __init__(
+        self,
+        model: str,
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+        max_output_tokens: int = 4096,
+        timeout: float = 30.0,
+        http_pool: Optional[HttpPool] = None,
+        stream: bool = False,
+        system_prompt: str = SYSTEM_PROMPT,
+        prompt_cache: bool = True,
+    ) -> None:
         super().__init__("anthropic")
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY is not set")
-        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+        http_client = http_pool.client(anthropic.DefaultAsyncHttpxClient) if http_pool else None
+        self._http_client = http_client
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key, timeout=timeout, http_client=http_client
+        )
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.max_output_tokens = max_output_tokens
+        self.timeout = timeout
+        self.streaming = stream
+        self.system_prompt = system_prompt
+        self.prompt_cache = prompt_cache
+
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        message = await self.client.messages.create(**self._request(prompt, max_tokens))
+        self._record_usage(self._usage(message.usage))
+        return message.content[0].text
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        async with self.client.messages.stream(**self._request(prompt, max_tokens)) as stream:
+            async for text in stream.text_stream:
+                yield text
+            message = await stream.get_final_message()
+        self._record_usage(self._usage(message.usage))
 
-    async def generate(self, prompt: str) -> ModelDecision:
-        message = await self.client.messages.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
-            system="You are a trading signal model. Reply with JSON only.",
-            messages=[{"role": "user", "content": prompt}],
+    def _request(self, prompt: str, max_tokens: Optional[int]) -> Dict[str, Any]:
+        system: Dict[str, Any] = {"type": "text", "text": self.system_prompt}
+        if self.prompt_cache:
+            system["cache_control"] = {"type": "ephemeral"}
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature,
+            "system": [system],
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    @staticmethod
+    def _usage(usage: Any) -> TokenUsage:
+        # Anthropic reports cached input separately from input_tokens; fold it back
+        # in so prompt_tokens means the same thing for every provider.
+        cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+        written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        return TokenUsage(
+            prompt_tokens=(getattr(usage, "input_tokens", 0) or 0) + cached + written,
+            completion_tokens=getattr(usage, "output_tokens", 0) or 0,
+            cached_tokens=cached,
+            cache_write_tokens=written,
+            requests=1,
         )
-        content = message.content[0].text
-        parsed = json.loads(content)
-        return self._normalize_payload(parsed)
+
+    async def warmup(self) -> None:
+        if self._http_client is not None:
+            await prewarm(self._http_client, str(self.client.base_url))
 
     async def aclose(self) -> None:
-        await self.client.close()
+        # A shared pool is owned and closed by the engine.
+        if self._http_client is None:
+            await self.client.close()
@@ -1,22 +1,94 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Dict
+import dataclasses
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
-from ..types import ModelDecision, TradeAction
+from ..metrics import PROVIDER_TOKENS
+from ..types import ModelDecision, TokenUsage, TradeAction
+from .jsonstream import IncrementalJSONParser
+
+LOGGER = logging.getLogger(__name__)
 
 
 class ModelProvider(abc.ABC):
     name: str
+    model: Optional[str] = None
+    max_tokens: int = 512
+    max_output_tokens: int = 4096
+    streaming: bool = False
 
     def __init__(self, name: str) -> None:
         self.name = name
+        self.usage = TokenUsage()
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def batch_limit(self) -> int:
+        """Most symbols per batched request whose replies fit in ``max_output_tokens``."""
+        return max(1, self.max_output_tokens // max(1, self.max_tokens))
 
     @abc.abstractmethod
-    async def generate(self, prompt: str) -> ModelDecision:
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
         raise NotImplementedError
 
-    def _normalize_payload(self, payload: Dict[str, Any]) -> ModelDecision:
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        yield await self.complete(prompt, max_tokens)
+
+    async def generate(self, prompt: str) -> ModelDecision:
+        content = await self.complete(prompt)
+        return self._normalize_payload(json.loads(content))
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[ModelDecision]:
+        """Yield a provisional decision once action and confidence are known, then the final one."""
+        if not self.streaming:
+            yield await self.generate(prompt)
+            return
+        parser = IncrementalJSONParser()
+        announced = False
+        async for chunk in self.stream(prompt):
+            fields = parser.feed(chunk)
+            if not announced and "action" in fields and "confidence" in fields:
+                announced = True
+                yield dataclasses.replace(self._normalize_payload(fields), provisional=True)
+        yield self._normalize_payload(parser.close())
+
+    async def generate_batch(self, prompt: str, symbols: Sequence[str]) -> List[ModelDecision]:
+        max_tokens = min(self.max_tokens * max(1, len(symbols)), self.max_output_tokens)
+        content = await self.complete(prompt, max_tokens=max_tokens)
+        return self._normalize_batch(json.loads(content), symbols)
+
+    async def warmup(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
+
+    def _record_usage(self, usage: TokenUsage) -> None:
+        self.usage.add(usage)
+        counts = {
+            "prompt": usage.prompt_tokens,
+            "cached": usage.cached_tokens,
+            "cache_write": usage.cache_write_tokens,
+            "completion": usage.completion_tokens,
+        }
+        for kind, count in counts.items():
+            PROVIDER_TOKENS.inc(count, provider=self.name, kind=kind)
+        LOGGER.info(
+            "Provider %s tokens: prompt=%d (cached %d, cache write %d) completion=%d",
+            self.name,
+            usage.prompt_tokens,
+            usage.cached_tokens,
+            usage.cache_write_tokens,
+            usage.completion_tokens,
+        )
+
+    def _normalize_payload(self, payload: Dict[str, Any], symbol: Optional[str] = None) -> ModelDecision:
         try:
             action_raw = str(payload.get("action", "hold")).lower()
             action = TradeAction(action_raw if action_raw in TradeAction._value2member_map_ else "hold")
@@ -27,7 +99,32 @@ class ModelProvider(abc.ABC):
                 take_pct=float(payload.get("take_pct", 0.0)),
                 reason=str(payload.get("reason", "")),
                 provider=self.name,
+                symbol=symbol,
             )
-        except (TypeError, ValueError) as exc:
+        except (TypeError, ValueError, AttributeError) as exc:
             raise ValueError(f"Invalid payload from provider {self.name}: {payload}") from exc
         return decision
+
+    def _normalize_batch(self, payload: Any, symbols: Sequence[str]) -> List[ModelDecision]:
+        if isinstance(payload, dict) and "decisions" in payload:
+            payload = payload["decisions"]
+        if isinstance(payload, dict):
+            payload = [{"symbol": symbol, **entry} for symbol, entry in payload.items() if isinstance(entry, dict)]
+        if not isinstance(payload, list):
+            raise ValueError(f"Invalid batch payload from provider {self.name}: {payload}")
+
+        requested = set(symbols)
+        decisions: Dict[str, ModelDecision] = {}
+        for entry in payload:
+            symbol = entry.get("symbol") if isinstance(entry, dict) else None
+            if symbol not in requested:
+                LOGGER.warning("Provider %s returned unexpected entry: %s", self.name, entry)
+                continue
+            try:
+                decisions[symbol] = self._normalize_payload(entry, symbol=symbol)
+            except ValueError as exc:
+                LOGGER.warning("Skipping %s decision from %s: %s", symbol, self.name, exc)
+        missing = requested.difference(decisions)
+        if missing:
+            LOGGER.warning("Provider %s returned no decision for %s", self.name, sorted(missing))
+        return list(decisions.values())
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import logging
+from types import ModuleType
+from typing import Any, Dict, Optional
+
+import httpx
+
+from ..config import HttpConfig
+
+LOGGER = logging.getLogger(__name__)
+
+_HTTP_MODULES = ("httpx", "httpx2")
+
+
+def _http_module(client_class: type) -> ModuleType:
+    # Newer provider SDKs ship on httpx2, which rejects httpx objects (and vice versa).
+    for cls in client_class.__mro__:
+        root = cls.__module__.partition(".")[0]
+        if root in _HTTP_MODULES:
+            return importlib.import_module(root)
+    raise TypeError(f"{client_class!r} is not an httpx-compatible client class")
+
+
+class HttpPool:
+    def __init__(self, cfg: HttpConfig, timeout: float = 30.0) -> None:
+        self.cfg = cfg
+        self.timeout = timeout
+        self._clients: Dict[str, Any] = {}
+
+    def client(self, client_class: Optional[type] = None) -> Any:
+        client_class = client_class or httpx.AsyncClient
+        module = _http_module(client_class)
+        client = self._clients.get(module.__name__)
+        if client is None:
+            client = self._clients[module.__name__] = self._build(client_class, module)
+        return client
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    def _build(self, client_class: type, module: ModuleType) -> Any:
+        http2 = self.cfg.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            LOGGER.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        limits = module.Limits(
+            max_connections=self.cfg.max_connections,
+            max_keepalive_connections=self.cfg.max_keepalive_connections,
+            keepalive_expiry=self.cfg.keepalive_expiry,
+        )
+        return client_class(http2=http2, limits=limits, timeout=self.timeout)
+
+
+async def prewarm(client: Any, url: str) -> None:
+    # Any response will do: the point is to pay for DNS, TCP and TLS up front.
+    try:
+        await client.head(url)
+    except Exception as exc:  # pylint: disable=broad-except
+        LOGGER.warning("Pre-warming %s failed: %s", url, exc)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+
+class IncrementalJSONParser:
+    """Decode the members of a streamed JSON object as soon as each one is complete.
+
+    Only the top-level object is tracked: a member is handed to ``json.loads`` once
+    the scanner reaches the ``,`` or ``}`` that ends it, so nested values and
+    escaped strings are decoded by the standard library rather than by hand.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = -1
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        self._buffer += chunk
+        buffer = self._buffer
+        for index in range(self._pos, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = index + 1
+            elif char in "}]":
+                if self._depth == 1:
+                    self._close_member(index)
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                self._close_member(index)
+                self._member_start = index + 1
+        self._pos = len(buffer)
+        return self.fields
+
+    def close(self) -> Dict[str, Any]:
+        payload = json.loads(self._buffer)
+        if not isinstance(payload, dict):
+            raise ValueError(f"Expected a JSON object, got {payload!r}")
+        return payload
+
+    def _close_member(self, end: int) -> None:
+        member = self._buffer[self._member_start : end].strip()
+        if not member:
+            return
+        try:
+            self.fields.update(json.loads("{" + member + "}"))
+        except ValueError:
+            # Left for close() to report with the full document.
+            pass
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 import httpx
 
-from ..types import ModelDecision
+from ..strategy import SYSTEM_PROMPT
+from ..types import TokenUsage
 from .base import ModelProvider
+from .http import prewarm
 
 
 class OpenAICompatibleProvider(ModelProvider):
@@ -20,8 +22,12 @@ class OpenAICompatibleProvider(ModelProvider):
         temperature: float = 0.2,
         top_p: float = 1.0,
         max_tokens: int = 512,
+        max_output_tokens: int = 4096,
         timeout: float = 30.0,
         extra_headers: Optional[Dict[str, str]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        stream: bool = False,
+        system_prompt: str = SYSTEM_PROMPT,
     ) -> None:
         super().__init__(name)
         self.base_url = base_url.rstrip("/")
@@ -30,37 +36,89 @@ class OpenAICompatibleProvider(ModelProvider):
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
+        self.max_output_tokens = max_output_tokens
         self.timeout = timeout
         self.extra_headers = extra_headers or {}
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self.streaming = stream
+        self.system_prompt = system_prompt
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=self.timeout)
 
-    async def generate(self, prompt: str) -> ModelDecision:
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        response = await self._client.post(
+            f"{self.base_url}/chat/completions",
+            json=self._payload(prompt, max_tokens),
+            headers=self._headers(),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._record_usage(self._usage(data.get("usage")))
+        return data["choices"][0]["message"]["content"]
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
         payload = {
+            **self._payload(prompt, max_tokens),
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        async with self._client.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json=payload,
+            headers=self._headers(),
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("usage"):
+                    self._record_usage(self._usage(chunk["usage"]))
+                for choice in chunk.get("choices") or []:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+
+    def _payload(self, prompt: str, max_tokens: Optional[int]) -> Dict[str, Any]:
+        return {
             "model": self.model,
             "response_format": {"type": "json_object"},
+            # The system prompt leads every request so it forms a stable prefix
+            # for OpenAI's automatic prompt caching.
             "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a trading signal model. Reply with JSON only.",
-                },
+                {"role": "system", "content": self.system_prompt},
                 {"role": "user", "content": prompt},
             ],
             "temperature": self.temperature,
             "top_p": self.top_p,
-            "max_tokens": self.max_tokens,
+            "max_tokens": max_tokens or self.max_tokens,
         }
-        headers = {"Authorization": f"Bearer {self.api_key}", **self.extra_headers}
-        response = await self._client.post(
-            f"{self.base_url}/chat/completions", json=payload, headers=headers
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}", **self.extra_headers}
+
+    @staticmethod
+    def _usage(usage: Optional[Dict[str, Any]]) -> TokenUsage:
+        usage = usage or {}
+        details = usage.get("prompt_tokens_details") or {}
+        return TokenUsage(
+            prompt_tokens=usage.get("prompt_tokens") or 0,
+            completion_tokens=usage.get("completion_tokens") or 0,
+            cached_tokens=details.get("cached_tokens") or 0,
+            requests=1,
         )
-        response.raise_for_status()
-        data = response.json()
-        content = data["choices"][0]["message"]["content"]
-        parsed = json.loads(content)
-        return self._normalize_payload(parsed)
+
+    async def warmup(self) -> None:
+        await prewarm(self._client, self.base_url)
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
 
 class OpenAIProvider(OpenAICompatibleProvider):
@@ -75,7 +133,10 @@ class OpenAIProvider(OpenAICompatibleProvider):
             temperature=kwargs.get("temperature", 0.2),
             top_p=kwargs.get("top_p", 1.0),
             max_tokens=kwargs.get("max_tokens", 512),
+            max_output_tokens=kwargs.get("max_output_tokens", 4096),
             timeout=kwargs.get("timeout", 30.0),
+            client=kwargs.get("client"),
+            stream=kwargs.get("stream", False),
         )
 
 
@@ -89,5 +150,8 @@ class GrokProvider(OpenAICompatibleProvider):
             temperature=kwargs.get("temperature", 0.2),
             top_p=kwargs.get("top_p", 1.0),
             max_tokens=kwargs.get("max_tokens", 512),
+            max_output_tokens=kwargs.get("max_output_tokens", 4096),
             timeout=kwargs.get("timeout", 30.0),
+            client=kwargs.get("client"),
+            stream=kwargs.get("stream", False),
         )
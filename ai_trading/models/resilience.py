@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+from ..config import ProviderPolicyConfig
+from .base import ModelProvider
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ProviderUnavailable(RuntimeError):
+    pass
+
+
+def _quantile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class ResilientProvider(ModelProvider):
+    def __init__(
+        self,
+        inner: ModelProvider,
+        policy: ProviderPolicyConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(inner.name)
+        self.inner = inner
+        self.policy = policy
+        self.clock = clock
+        self.model = inner.model
+        self.max_tokens = inner.max_tokens
+        self.max_output_tokens = inner.max_output_tokens
+        self.streaming = inner.streaming
+        self.usage = inner.usage
+        self.hedges = 0
+        self._latencies: Deque[float] = deque(maxlen=max(1, policy.window))
+        self._outcomes: Deque[bool] = deque(maxlen=max(1, policy.window))
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def available(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self.clock() - self._opened_at < self.policy.breaker_cooldown:
+            return False
+        return not self._probe_in_flight
+
+    def latency(self, q: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        return _quantile(list(self._latencies), q)
+
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return 1 - sum(self._outcomes) / len(self._outcomes)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "p50": self.latency(0.5),
+            "p95": self.latency(0.95),
+            "error_rate": round(self.error_rate(), 3),
+            "hedges": self.hedges,
+            "state": "closed" if self._opened_at is None else "open",
+        }
+
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        self._acquire()
+        start = self.clock()
+        try:
+            content = await self._hedged(lambda: self.inner.complete(prompt, max_tokens))
+        except asyncio.CancelledError:
+            self._cancelled(start)
+            raise
+        except Exception:
+            self._record(False, self.clock() - start)
+            raise
+        self._record(True, self.clock() - start)
+        return content
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        # Streams are not hedged: a duplicate stream would double the token spend
+        # for a response that is already being consumed.
+        self._acquire()
+        start = self.clock()
+        try:
+            async for chunk in self.inner.stream(prompt, max_tokens):
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            self._cancelled(start)
+            raise
+        except Exception:
+            self._record(False, self.clock() - start)
+            raise
+        self._record(True, self.clock() - start)
+
+    async def warmup(self) -> None:
+        await self.inner.warmup()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def _acquire(self) -> None:
+        if not self.available:
+            raise ProviderUnavailable(f"Provider {self.name} circuit is open")
+        if self._opened_at is not None:
+            self._probe_in_flight = True
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.policy.hedge or len(self._latencies) < self.policy.hedge_min_samples:
+            return None
+        return self.latency(self.policy.hedge_quantile)
+
+    async def _hedged(self, factory: Callable[[], Awaitable[str]]) -> str:
+        tasks = [asyncio.ensure_future(factory())]
+        try:
+            delay = self._hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self.hedges += 1
+                    LOGGER.info(
+                        "Provider %s slower than p%.0f (%.2fs), sending hedged request",
+                        self.name,
+                        self.policy.hedge_quantile * 100,
+                        delay,
+                    )
+                    tasks.append(asyncio.ensure_future(factory()))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark retrieved; the outcome was already handled
+
+    def _cancelled(self, start: float) -> None:
+        # A call cancelled by early exit took at least this long; leaving it out
+        # would bias the hedge threshold towards the fast calls.
+        self._probe_in_flight = False
+        self._latencies.append(self.clock() - start)
+
+    def _record(self, ok: bool, latency: float) -> None:
+        self._probe_in_flight = False
+        self._outcomes.append(ok)
+        if ok:
+            self._latencies.append(latency)
+            self._consecutive_failures = 0
+            if self._opened_at is not None:
+                LOGGER.info("Provider %s recovered, closing circuit", self.name)
+                self._opened_at = None
+                self._outcomes.clear()
+            return
+
+        self._consecutive_failures += 1
+        tripped = self._consecutive_failures >= self.policy.breaker_failures or (
+            len(self._outcomes) >= self.policy.breaker_min_calls
+            and self.error_rate() >= self.policy.breaker_error_rate
+        )
+        if self._opened_at is not None or tripped:
+            if self._opened_at is None:
+                LOGGER.warning(
+                    "Provider %s circuit opened for %.0fs (error rate %.2f)",
+                    self.name,
+                    self.policy.breaker_cooldown,
+                    self.error_rate(),
+                )
+            self._opened_at = self.clock()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import ccxt
+
+from .config import OrderConfig
+from .exchange import AsyncExchange
+from .metrics import STAGE_ERRORS, STAGE_SECONDS
+
+LOGGER = logging.getLogger(__name__)
+
+UNFILLED_STATUSES = {"canceled", "cancelled", "expired", "rejected"}
+FINAL_STATUSES = UNFILLED_STATUSES | {"closed"}
+
+
+@dataclass
+class Fill:
+    order_id: str
+    symbol: str
+    side: str
+    amount: float
+    price: float
+    timestamp: int
+    # Price the order was sized with, if the caller passed one to submit().
+    reference_price: Optional[float] = None
+
+
+@dataclass
+class TrackedOrder:
+    id: str
+    symbol: str
+    side: str
+    amount: float
+    timestamp: int
+    price: Optional[float] = None
+    status: str = "open"
+    filled: float = 0.0
+    average: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def final(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+
+class OrderManager:
+    """Submit orders concurrently and follow them to a final state.
+
+    At most ``max_in_flight`` order requests run at once (ccxt's own rate limiter
+    still spaces them out). Open orders are polled every ``poll_interval``
+    seconds with one ``fetch_orders`` call per symbol, whatever the number of
+    orders; exchanges without ``fetchOrders`` get one ``fetch_open_orders`` per
+    symbol plus a ``fetch_order`` for each order that left the open set. Every
+    increase of an order's filled amount is published as a ``Fill`` to the
+    listeners and to ``fills()`` iterators; done listeners see each order once it
+    reaches a final state.
+    """
+
+    def __init__(
+        self,
+        cfg: OrderConfig,
+        exchange: AsyncExchange,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cfg = cfg
+        self.exchange = exchange
+        self.clock = clock
+        self.open_orders: Dict[str, TrackedOrder] = {}
+        self._semaphore = asyncio.Semaphore(max(1, cfg.max_in_flight))
+        self._listeners: List[Callable[[Fill], None]] = []
+        self._done_listeners: List[Callable[[TrackedOrder], None]] = []
+        self._subscribers: List["asyncio.Queue[Fill]"] = []
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._fetch_orders_supported = True
+
+    def add_listener(self, listener: Callable[[Fill], None]) -> None:
+        self._listeners.append(listener)
+
+    def add_done_listener(self, listener: Callable[[TrackedOrder], None]) -> None:
+        self._done_listeners.append(listener)
+
+    async def fills(self) -> AsyncIterator[Fill]:
+        queue: "asyncio.Queue[Fill]" = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
+
+    async def submit(
+        self, symbol: str, side: str, amount: float, price: Optional[float] = None
+    ) -> TrackedOrder:
+        """Place a market order; ``price`` is used for fills reported without a price."""
+        async with self._semaphore:
+            with STAGE_SECONDS.time(STAGE_ERRORS, stage="submit_order", symbol=symbol):
+                response = await self.exchange.create_market_order(symbol, side, amount)
+        order = TrackedOrder(
+            id=str(response.get("id")),
+            symbol=symbol,
+            side=side,
+            amount=amount,
+            timestamp=int(response.get("timestamp") or self.clock() * 1000),
+            price=price,
+        )
+        self._update(order, response)
+        if not order.final:
+            self.open_orders[order.id] = order
+        return order
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def poll(self) -> None:
+        by_symbol: Dict[str, List[TrackedOrder]] = {}
+        for order in self.open_orders.values():
+            by_symbol.setdefault(order.symbol, []).append(order)
+        results = await asyncio.gather(
+            *(self._poll_symbol(symbol, orders) for symbol, orders in by_symbol.items()),
+            return_exceptions=True,
+        )
+        for symbol, result in zip(by_symbol, results):
+            if isinstance(result, Exception):
+                LOGGER.warning("Failed to poll orders for %s: %s", symbol, result)
+
+    async def _poll_symbol(self, symbol: str, orders: List[TrackedOrder]) -> None:
+        since = min(order.timestamp for order in orders)
+        async with self._semaphore:
+            with STAGE_SECONDS.time(STAGE_ERRORS, stage="poll_orders", symbol=symbol):
+                remote = await self._fetch_states(symbol, orders, since)
+        for order in orders:
+            state = remote.get(order.id)
+            if state is not None:
+                self._update(order, state)
+            if order.final:
+                self.open_orders.pop(order.id, None)
+
+    async def _fetch_states(
+        self, symbol: str, orders: List[TrackedOrder], since: int
+    ) -> Dict[str, Dict[str, Any]]:
+        if self._fetch_orders_supported:
+            try:
+                remote = await self.exchange.fetch_orders(symbol, since)
+                return {str(o.get("id")): o for o in remote}
+            except ccxt.NotSupported:
+                LOGGER.info("fetch_orders not supported; polling open orders instead")
+                self._fetch_orders_supported = False
+        remote = await self.exchange.fetch_open_orders(symbol, since)
+        states = {str(o.get("id")): o for o in remote}
+        for order in orders:
+            if order.id not in states:
+                states[order.id] = await self.exchange.fetch_order(order.id, symbol)
+        return states
+
+    def _update(self, order: TrackedOrder, state: Dict[str, Any]) -> None:
+        status = state.get("status") or order.status
+        filled = state.get("filled")
+        if filled is None and status == "closed":
+            filled = order.amount  # some exchanges only report the status
+        average = state.get("average") or state.get("price")
+        if filled is not None and float(filled) > order.filled:
+            filled = float(filled)
+            delta = filled - order.filled
+            price = float(average) if average else order.price
+            if average and order.average is not None and order.filled:
+                # Price of just the new part, from the change in the running average.
+                price = (float(average) * filled - order.average * order.filled) / delta
+            order.filled = filled
+            if price and price > 0:
+                self._publish(
+                    Fill(
+                        order.id,
+                        order.symbol,
+                        order.side,
+                        delta,
+                        price,
+                        int(self.clock() * 1000),
+                        reference_price=order.price,
+                    )
+                )
+            else:
+                LOGGER.warning(
+                    "Order %s filled %.6f without a price; fill not published", order.id, delta
+                )
+        if average:
+            order.average = float(average)
+        order.status = status
+        if order.final and not order.done.is_set():
+            order.done.set()
+            LOGGER.info(
+                "Order %s %s %s %s: filled %.6f/%.6f",
+                order.id,
+                order.side,
+                order.symbol,
+                order.status,
+                order.filled,
+                order.amount,
+            )
+            self._notify(self._done_listeners, order)
+
+    def _publish(self, fill: Fill) -> None:
+        self._notify(self._listeners, fill)
+        for queue in self._subscribers:
+            queue.put_nowait(fill)
+
+    @staticmethod
+    def _notify(listeners: List[Callable[[Any], None]], event: Any) -> None:
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.exception("Order listener failed: %s", exc)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.cfg.poll_interval)
+            if self.open_orders:
+                await self.poll()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import ccxt
+
+from .config import PriceConfig
+from .exchange import AsyncExchange
+from .metrics import PRICE_REQUESTS, STAGE_ERRORS, STAGE_SECONDS
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceQuote:
+    price: float
+    received: float
+
+
+def ticker_price(ticker: Dict[str, Any]) -> Optional[float]:
+    """Last trade price of a ccxt ticker, falling back to the close or the bid/ask mid."""
+    for key in ("last", "close"):
+        value = ticker.get(key)
+        if value:
+            return float(value)
+    bid, ask = ticker.get("bid"), ticker.get("ask")
+    if bid and ask:
+        return (float(bid) + float(ask)) / 2
+    return None
+
+
+class PriceCache:
+    """Last prices for a set of symbols, kept fresh by one bulk ``fetch_tickers`` poll.
+
+    ``price()`` answers from the cache while a quote is younger than
+    ``max_age_seconds`` and otherwise fetches that symbol's ticker (one request
+    per symbol at a time, however many callers wait on it). Symbols looked up
+    that way are added to the poll once their ticker has a price. A symbol the
+    exchange rejects is dropped from the poll instead of failing it for all.
+    """
+
+    def __init__(
+        self,
+        cfg: PriceConfig,
+        exchange: AsyncExchange,
+        symbols: Iterable[str] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.cfg = cfg
+        self.exchange = exchange
+        self.symbols = set(symbols)
+        self.clock = clock
+        self._quotes: Dict[str, PriceQuote] = {}
+        self._pending: Dict[str, "asyncio.Future[float]"] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get(self, symbol: str) -> Optional[float]:
+        """Cached price if it is fresh enough, without touching the exchange."""
+        quote = self._quotes.get(symbol)
+        if quote is None or self.clock() - quote.received > self.cfg.max_age_seconds:
+            return None
+        return quote.price
+
+    async def price(self, symbol: str) -> float:
+        cached = self.get(symbol)
+        if cached is not None:
+            PRICE_REQUESTS.inc(result="hit")
+            return cached
+        PRICE_REQUESTS.inc(result="fallback")
+        pending = self._pending.get(symbol)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_one(symbol))
+            self._pending[symbol] = pending
+            pending.add_done_callback(lambda future: self._done(symbol, future))
+        return await asyncio.shield(pending)
+
+    async def refresh(self) -> None:
+        if not self.symbols:
+            return
+        try:
+            with STAGE_SECONDS.time(STAGE_ERRORS, stage="fetch_tickers", symbol="batch"):
+                tickers = await self.exchange.fetch_tickers(sorted(self.symbols))
+        except ccxt.BadSymbol as exc:
+            LOGGER.warning("Bulk ticker fetch rejected a symbol (%s); checking each symbol", exc)
+            await self._prune()
+            return
+        received = self.clock()
+        for symbol, ticker in tickers.items():
+            price = ticker_price(ticker)
+            # Some exchanges ignore the filter and return every market.
+            if price is not None and symbol in self.symbols:
+                self._quotes[symbol] = PriceQuote(price, received)
+
+    async def _fetch_one(self, symbol: str) -> float:
+        with STAGE_SECONDS.time(STAGE_ERRORS, stage="fetch_ticker", symbol=symbol):
+            ticker = await self.exchange.fetch_ticker(symbol)
+        price = ticker_price(ticker)
+        if price is None:
+            raise ValueError(f"Ticker for {symbol} has no price")
+        self._quotes[symbol] = PriceQuote(price, self.clock())
+        self.symbols.add(symbol)
+        return price
+
+    async def _prune(self) -> None:
+        # One request per symbol, once: the bulk poll works again without the bad ones.
+        symbols = sorted(self.symbols)
+        results = await asyncio.gather(
+            *(self._fetch_one(symbol) for symbol in symbols), return_exceptions=True
+        )
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, ccxt.BadSymbol):
+                self.symbols.discard(symbol)
+                LOGGER.warning("Dropped %s from the ticker poll: %s", symbol, result)
+
+    def _done(self, symbol: str, future: "asyncio.Future[float]") -> None:
+        self._pending.pop(symbol, None)
+        if not future.cancelled() and future.exception() is not None:
+            LOGGER.warning("Failed to fetch ticker for %s: %s", symbol, future.exception())
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Ticker poll failed: %s", exc)
+            await asyncio.sleep(self.cfg.poll_interval)
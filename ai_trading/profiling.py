@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class TaskTiming:
+    count: int = 0
+    busy: float = 0.0
+    wall: float = 0.0
+    max_step: float = 0.0
+
+
+class _TimedCoroutine:
+    """Coroutine proxy that measures how long each step holds the event loop."""
+
+    def __init__(self, coro: Any, timing: TaskTiming) -> None:
+        self._coro = coro
+        self._timing = timing
+        self._started = time.perf_counter()
+
+    def send(self, value: Any) -> Any:
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args: Any) -> Any:
+        return self._step(self._coro.throw, *args)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self) -> "_TimedCoroutine":
+        return self
+
+    def __iter__(self) -> "_TimedCoroutine":
+        return self
+
+    def __next__(self) -> Any:
+        return self.send(None)
+
+    def _step(self, method: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        except BaseException:
+            self._timing.count += 1
+            self._timing.wall += time.perf_counter() - self._started
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._timing.busy += elapsed
+            self._timing.max_step = max(self._timing.max_step, elapsed)
+
+
+class StackSampler:
+    """Sample every thread's Python stack into flamegraph collapsed-stack counts."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    code = frame.f_code
+                    labels.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)).replace(" ", "_"))
+                self.stacks[";".join(reversed(labels))] += 1
+
+
+class CycleProfiler:
+    """Profile engine cycles with cProfile, a stack sampler and per-task loop timing.
+
+    Writes ``cycles.pstats`` (open with ``python -m pstats`` or snakeviz),
+    ``cycles.collapsed`` (feed to flamegraph.pl or speedscope) and ``tasks.txt``
+    into ``output_dir``.
+    """
+
+    def __init__(self, output_dir: Path, interval: float = 0.005, top: int = 20) -> None:
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(interval)
+        self.tasks: Dict[str, TaskTiming] = {}
+        self.cycles: List[float] = []
+
+    async def run(self, cycle: Callable[[], Awaitable[None]], cycles: int) -> None:
+        loop = asyncio.get_running_loop()
+        previous_factory = loop.get_task_factory()
+        loop.set_task_factory(self._task_factory)
+        self.sampler.start()
+        try:
+            for index in range(cycles):
+                started = time.perf_counter()
+                self.profile.enable()
+                try:
+                    # Run as a task so the cycle itself shows up in the task timings.
+                    await loop.create_task(cycle())
+                finally:
+                    self.profile.disable()
+                self.cycles.append(time.perf_counter() - started)
+                LOGGER.info("Profiled cycle %d/%d in %.3fs", index + 1, cycles, self.cycles[-1])
+        finally:
+            self.sampler.stop()
+            loop.set_task_factory(previous_factory)
+
+    def write(self) -> Dict[str, Path]:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "pstats": self.output_dir / "cycles.pstats",
+            "collapsed": self.output_dir / "cycles.collapsed",
+            "tasks": self.output_dir / "tasks.txt",
+        }
+        self.profile.dump_stats(str(paths["pstats"]))
+        self.sampler.write(paths["collapsed"])
+        paths["tasks"].write_text(self._task_table(), encoding="utf-8")
+        return paths
+
+    def summary(self) -> str:
+        out = io.StringIO()
+        if self.cycles:
+            out.write(
+                f"{len(self.cycles)} cycles: mean {sum(self.cycles) / len(self.cycles):.3f}s, "
+                f"max {max(self.cycles):.3f}s\n\n"
+            )
+        out.write(f"Top {self.top} functions by cumulative time:\n")
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        out.write(f"Top {self.top} functions by own time:\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        out.write(f"Top {self.top} asyncio tasks by time holding the event loop:\n")
+        out.write(self._task_table(self.top))
+        return out.getvalue()
+
+    def _task_table(self, limit: Optional[int] = None) -> str:
+        rows = sorted(self.tasks.items(), key=lambda item: item[1].busy, reverse=True)[:limit]
+        lines = [f"{'task':60} {'count':>6} {'busy_s':>9} {'wall_s':>9} {'max_step_s':>10}"]
+        for name, timing in rows:
+            lines.append(
+                f"{name[:60]:60} {timing.count:>6} {timing.busy:>9.4f} "
+                f"{timing.wall:>9.4f} {timing.max_step:>10.4f}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def _task_factory(self, loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any):
+        name = getattr(coro, "__qualname__", type(coro).__name__)
+        timing = self.tasks.setdefault(name, TaskTiming())
+        return asyncio.Task(_TimedCoroutine(coro, timing), loop=loop, **kwargs)
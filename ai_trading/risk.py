@@ -2,20 +2,26 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
+from typing import Callable
 
 from .config import RiskConfig
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _utcnow() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
 class RiskManager:
-    def __init__(self, cfg: RiskConfig) -> None:
+    def __init__(self, cfg: RiskConfig, clock: Callable[[], datetime] = _utcnow) -> None:
         self.cfg = cfg
-        self.session_start = datetime.now(tz=timezone.utc)
+        self.clock = clock
+        self.session_start = clock()
         self.session_loss = 0.0
 
     def reset_if_new_day(self) -> None:
-        now = datetime.now(tz=timezone.utc)
+        now = self.clock()
         if now.date() != self.session_start.date():
             self.session_start = now
             self.session_loss = 0.0
@@ -25,6 +31,10 @@ class RiskManager:
         self.session_loss -= abs(amount)
         LOGGER.info("Reserved risk %.2f (session loss %.2f)", amount, self.session_loss)
 
+    def release_risk(self, amount: float) -> None:
+        self.session_loss += abs(amount)
+        LOGGER.info("Released risk %.2f (session loss %.2f)", amount, self.session_loss)
+
     def register_loss(self, amount: float) -> None:
         self.session_loss -= abs(amount)
         LOGGER.warning("Loss registered: %.2f (session loss %.2f)", amount, self.session_loss)
@@ -33,23 +43,26 @@ class RiskManager:
         self.session_loss += abs(amount)
         LOGGER.info("Profit registered: %.2f (session loss %.2f)", amount, self.session_loss)
 
-    def allow_trade(self, risk_amount: float) -> bool:
+    def loss_limit(self, balance: float) -> float:
+        """Daily loss limit in quote currency; ``daily_loss_limit`` is a fraction of ``balance``."""
+        return self.cfg.daily_loss_limit * balance
+
+    def allow_trade(self, risk_amount: float, balance: float) -> bool:
         if not self.cfg.kill_switch:
             return True
+        limit = self.loss_limit(balance)
         projected = self.session_loss - risk_amount
-        allowed = projected >= -self.cfg.daily_loss_limit
+        allowed = projected >= -limit
         if not allowed:
             LOGGER.error(
-                "Trade blocked: projected daily loss %.2f exceeds limit %.2f",
-                projected,
-                self.cfg.daily_loss_limit,
+                "Trade blocked: projected daily loss %.2f exceeds limit %.2f", projected, limit
             )
         return allowed
 
-    def check_kill_switch(self) -> bool:
+    def check_kill_switch(self, balance: float) -> bool:
         if not self.cfg.kill_switch:
             return False
-        threshold = self.cfg.daily_loss_limit
+        threshold = self.loss_limit(balance)
         breached = self.session_loss <= -threshold
         if breached:
             LOGGER.error(
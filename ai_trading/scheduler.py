@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from .candles import timeframe_ms
+from .config import Config, ScheduleConfig
+
+LOGGER = logging.getLogger(__name__)
+
+RunCycle = Callable[[str, List[str]], Awaitable[None]]
+
+
+def schedule_jobs(cfg: Config) -> Dict[str, List[str]]:
+    """Symbols to run per timeframe; timeframes without a symbol list use ``cfg.symbols``."""
+    if not cfg.schedule.timeframes:
+        return {cfg.data.timeframe: list(cfg.symbols)}
+    return {
+        timeframe: list(symbols or cfg.symbols)
+        for timeframe, symbols in cfg.schedule.timeframes.items()
+    }
+
+
+class CandleScheduler:
+    """Run a cycle per timeframe shortly after each candle close.
+
+    Cycles fire at every candle boundary (aligned to the UTC epoch, like exchange
+    candles) plus ``offset_seconds``, so they see the bar that just closed. The
+    wait is computed from the wall clock after every cycle, which absorbs the
+    cycle's own duration; a cycle overrunning the next boundary skips the missed
+    slots instead of running them back to back.
+    """
+
+    def __init__(
+        self,
+        cfg: ScheduleConfig,
+        jobs: Dict[str, List[str]],
+        run_cycle: RunCycle,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        for timeframe in jobs:
+            timeframe_ms(timeframe)  # fail fast on unknown timeframes
+        self.cfg = cfg
+        self.jobs = jobs
+        self.run_cycle = run_cycle
+        self.clock = clock
+        self.sleep = sleep
+        self.skipped: Dict[str, int] = {timeframe: 0 for timeframe in jobs}
+
+    def next_fire(self, timeframe: str, now: float) -> float:
+        interval = timeframe_ms(timeframe) / 1000
+        offset = self.cfg.offset_seconds
+        return (math.floor((now - offset) / interval) + 1) * interval + offset
+
+    async def run(self) -> None:
+        await asyncio.gather(
+            *(self._run_timeframe(timeframe, symbols) for timeframe, symbols in self.jobs.items())
+        )
+
+    async def run_once(self) -> None:
+        await asyncio.gather(
+            *(self._cycle(timeframe, symbols) for timeframe, symbols in self.jobs.items())
+        )
+
+    async def _run_timeframe(self, timeframe: str, symbols: List[str]) -> None:
+        interval = timeframe_ms(timeframe) / 1000
+        fire_at = self.next_fire(timeframe, self.clock())
+        LOGGER.info("Scheduling %s cycles for %s, first at %.0f", timeframe, symbols, fire_at)
+        while True:
+            while True:
+                delay = fire_at - self.clock()
+                if delay <= 0:
+                    break
+                await self.sleep(delay)
+            await self._cycle(timeframe, symbols)
+            next_fire = self.next_fire(timeframe, self.clock())
+            missed = int(round((next_fire - fire_at) / interval)) - 1
+            if missed > 0:
+                self.skipped[timeframe] += missed
+                LOGGER.warning(
+                    "%s cycle overran %d candle close(s); skipping to the next one", timeframe, missed
+                )
+            fire_at = next_fire
+
+    async def _cycle(self, timeframe: str, symbols: List[str]) -> None:
+        started = self.clock()
+        try:
+            await self.run_cycle(timeframe, symbols)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.exception("%s cycle failed: %s", timeframe, exc)
+        LOGGER.info("%s cycle finished in %.2fs", timeframe, self.clock() - started)
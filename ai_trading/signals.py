@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .config import SignalConfig
+from .types import OrderResult, TradeAction
+
+LOGGER = logging.getLogger(__name__)
+
+QUEUED, RUNNING, EXECUTED, SKIPPED, FAILED = "queued", "running", "executed", "skipped", "failed"
+
+
+@dataclass
+class Signal:
+    symbol: str
+    action: TradeAction
+    stop_pct: float
+    take_pct: float
+    confidence: float = 0.0
+    reason: Optional[str] = None
+
+
+@dataclass
+class SignalStatus:
+    id: str
+    symbol: str
+    side: str
+    status: str = QUEUED
+    duplicates: int = 0
+    submitted_at: float = 0.0
+    finished_at: Optional[float] = None
+    order: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class SignalQueue:
+    """Bounded queue of external signals executed by a fixed pool of worker tasks.
+
+    A signal for the same symbol and side as one submitted less than
+    ``coalesce_seconds`` earlier is not queued again; the caller gets the status
+    of the first one. ``submit`` raises ``asyncio.QueueFull`` once ``queue_size``
+    signals are waiting. The statuses of the last ``history`` signals are kept
+    for lookup by id.
+    """
+
+    def __init__(
+        self,
+        cfg: SignalConfig,
+        handler: Callable[[Signal], Awaitable[Optional[OrderResult]]],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cfg = cfg
+        self.handler = handler
+        self.clock = clock
+        self._queue: "asyncio.Queue[Tuple[Signal, SignalStatus]]" = asyncio.Queue(
+            maxsize=max(1, cfg.queue_size)
+        )
+        self._statuses: "OrderedDict[str, SignalStatus]" = OrderedDict()
+        self._recent: Dict[Tuple[str, str], SignalStatus] = {}
+        self._workers: List["asyncio.Task[None]"] = []
+        self._ids = itertools.count(1)
+        self._prefix = uuid.uuid4().hex[:8]
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        while len(self._workers) < max(1, self.cfg.workers):
+            self._workers.append(loop.create_task(self._work()))
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, signal: Signal) -> Tuple[SignalStatus, bool]:
+        """Queue ``signal``; returns its status and whether it was coalesced."""
+        now = self.clock()
+        key = (signal.symbol, signal.action.value)
+        previous = self._recent.get(key)
+        if previous is not None and now - previous.submitted_at < self.cfg.coalesce_seconds:
+            previous.duplicates += 1
+            LOGGER.info("Coalesced %s %s into signal %s", key[1], key[0], previous.id)
+            return previous, True
+
+        status = SignalStatus(
+            id=f"{self._prefix}-{next(self._ids)}",
+            symbol=signal.symbol,
+            side=signal.action.value,
+            submitted_at=now,
+        )
+        self._queue.put_nowait((signal, status))
+        self._recent[key] = status
+        self._statuses[status.id] = status
+        self._trim()
+        return status, False
+
+    def status(self, signal_id: str) -> Optional[SignalStatus]:
+        return self._statuses.get(signal_id)
+
+    def _trim(self) -> None:
+        while len(self._statuses) > max(1, self.cfg.history):
+            _, oldest = self._statuses.popitem(last=False)
+            key = (oldest.symbol, oldest.side)
+            if self._recent.get(key) is oldest:
+                del self._recent[key]
+
+    async def _work(self) -> None:
+        while True:
+            signal, status = await self._queue.get()
+            status.status = RUNNING
+            try:
+                order = await self.handler(signal)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.exception("Signal %s for %s failed: %s", status.id, signal.symbol, exc)
+                status.status, status.error = FAILED, str(exc)
+            else:
+                if order is None:
+                    status.status = SKIPPED
+                else:
+                    status.status = EXECUTED
+                    status.order = {
+                        "side": order.side.value,
+                        "size": order.size,
+                        "price": order.price,
+                        "status": order.status,
+                        "order_id": order.order_id,
+                    }
+            finally:
+                status.finished_at = self.clock()
+                self._queue.task_done()
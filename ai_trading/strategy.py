@@ -1,35 +1,93 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from textwrap import dedent
-from typing import Dict
+from typing import Any, Dict
 
+import numpy as np
 import pandas as pd
 
 from .types import TradeAction
 
 
+# Static instructions shared by every request. Keeping them in the system prompt,
+# byte-for-byte identical across calls, lets providers serve them from the prompt
+# cache; the per-request user message only carries the market data.
+SYSTEM_PROMPT = dedent(
+    """
+    You are a trading signal model and part of an ensemble of trading models. Each request
+    gives the latest market snapshot for one or more symbols on one timeframe. Decide
+    independently for each symbol whether to buy, sell, or hold.
+
+    Snapshot fields: open, high, low, close and volume of the latest candle, rsi (14-period
+    RSI), momentum_5 (5-candle return), candle (candle open time, UTC) and any extra
+    indicators, given as name=value pairs.
+
+    For a single symbol, reply strictly as JSON with keys: action (buy/sell/hold), confidence
+    (0-1 float), stop_pct (decimal percent of entry price for stop loss), take_pct (decimal
+    percent for take profit), and reason (concise string).
+
+    For several symbols, reply strictly as a JSON object {"decisions": [...]} with exactly
+    one entry per symbol. Each entry has key symbol (exactly as given) followed by the keys
+    of the single-symbol reply.
+    """
+).strip()
+
 PROMPT_TEMPLATE = dedent(
     """
-    You are part of an ensemble of trading models. You are given the latest market snapshot
-    for {symbol} on the {timeframe} timeframe. Decide whether to buy, sell, or hold.
-
-    Reply strictly as JSON with keys: action (buy/sell/hold), confidence (0-1 float),
-    stop_pct (decimal percent of entry price for stop loss), take_pct (decimal percent for
-    take profit), and reason (concise string).
-
-    Market data:
-    price_open: {open}
-    price_high: {high}
-    price_low: {low}
-    price_close: {close}
-    volume: {volume}
-    rsi: {rsi}
-    momentum_5: {momentum_5}
-    timestamp: {timestamp}
+    Symbol: {symbol}
+    Timeframe: {timeframe}
+    {snapshot}
     """
 ).strip()
 
+BATCH_PROMPT_TEMPLATE = dedent(
+    """
+    Timeframe: {timeframe}
+    Symbols: {count}
+    {markets}
+    """
+).strip()
+
+SYMBOL_TEMPLATE = "{symbol}: {snapshot}"
+
+SNAPSHOT_FIELDS = ("open", "high", "low", "close", "volume", "rsi", "momentum_5")
+
+
+def _format_number(value: float, precision: int) -> str:
+    # Significant digits without switching to exponent notation for prices.
+    return np.format_float_positional(
+        float(value), precision=precision, unique=True, fractional=False, trim="-"
+    )
+
+
+def encode_snapshot(snapshot: Dict[str, Any], precision: int = 6) -> str:
+    """One-line ``name=value`` encoding with ``precision`` significant digits."""
+    parts = [
+        f"{name}={_format_number(snapshot[name], precision)}"
+        for name in SNAPSHOT_FIELDS
+        if name in snapshot
+    ]
+    candle_time = snapshot.get("candle_time")
+    if candle_time is not None:
+        opened = datetime.fromtimestamp(candle_time / 1000, tz=timezone.utc)
+        parts.append(f"candle={opened:%Y-%m-%dT%H:%MZ}")
+    for name, value in (snapshot.get("indicators") or {}).items():
+        parts.append(f"{name}={_format_number(value, precision)}")
+    return " ".join(parts)
+
+
+def build_prompt(symbol: str, timeframe: str, snapshot: Dict[str, Any], precision: int = 6) -> str:
+    return PROMPT_TEMPLATE.format(
+        symbol=symbol, timeframe=timeframe, snapshot=encode_snapshot(snapshot, precision)
+    )
+
 
-def build_prompt(symbol: str, timeframe: str, snapshot: Dict[str, float]) -> str:
-    prompt = PROMPT_TEMPLATE.format(symbol=symbol, timeframe=timeframe, **snapshot)
-    return prompt
+def build_batch_prompt(
+    timeframe: str, snapshots: Dict[str, Dict[str, Any]], precision: int = 6
+) -> str:
+    markets = "\n".join(
+        SYMBOL_TEMPLATE.format(symbol=symbol, snapshot=encode_snapshot(snapshot, precision))
+        for symbol, snapshot in snapshots.items()
+    )
+    return BATCH_PROMPT_TEMPLATE.format(count=len(snapshots), timeframe=timeframe, markets=markets)
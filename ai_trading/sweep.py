@@ -0,0 +1,219 @@
+"""Grid search over ensemble and risk settings on one set of historical decisions.
+
+Provider decisions are computed once (deterministic rules) or loaded from a
+``backtest --record`` file, copied with the candles into shared memory and
+attached read-only by every worker of a process pool. Each worker only re-runs
+the vote, sizing and exit simulation of ``Backtester.simulate`` for its grid
+points; the results are collected into one table.
+
+Usage: python -m ai_trading.sweep candles.csv --symbol BTC/USDT [--replay decisions.npz]
+           [--min-confidence 0.5 0.6 0.7] [--require-agreement 1 2 3]
+           [--risk-per-trade 0.01 0.02] [--daily-loss-limit 0.03 0.05] [--output sweep.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .backtest import Backtester, DecisionLog, default_rules, load_ohlcv, select_range
+from .config import Config, DEFAULT_CONFIG_PATH, EnsembleConfig, RiskConfig
+
+LOGGER = logging.getLogger(__name__)
+
+# (shared memory block name, shape, dtype) per array.
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+_LOG_ARRAYS = ("bar", "candle_time", "side", "confidence", "stop_pct", "take_pct")
+
+SUMMARY_COLUMNS = (
+    "min_confidence",
+    "require_agreement",
+    "risk_per_trade",
+    "daily_loss_limit",
+    "trades",
+    "blocked",
+    "return",
+    "win_rate",
+    "profit_factor",
+    "max_drawdown",
+)
+
+_worker: Dict[str, Any] = {}
+
+
+def share_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[Dict[str, ArraySpec], List[SharedMemory]]:
+    """Copy ``arrays`` into shared memory blocks; the caller must unlink the blocks."""
+    specs: Dict[str, ArraySpec] = {}
+    blocks: List[SharedMemory] = []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = SharedMemory(create=True, size=max(1, array.nbytes))
+        blocks.append(block)
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return specs, blocks
+
+
+def attach_arrays(
+    specs: Dict[str, ArraySpec],
+) -> Tuple[Dict[str, np.ndarray], List[SharedMemory]]:
+    arrays: Dict[str, np.ndarray] = {}
+    blocks: List[SharedMemory] = []
+    for name, (block_name, shape, dtype) in specs.items():
+        block = SharedMemory(name=block_name)
+        blocks.append(block)
+        array = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    return arrays, blocks
+
+
+def grid(
+    ensemble: EnsembleConfig,
+    risk: RiskConfig,
+    min_confidence: Iterable[float],
+    require_agreement: Iterable[int],
+    risk_per_trade: Iterable[float],
+    daily_loss_limit: Iterable[float],
+) -> List[Tuple[EnsembleConfig, RiskConfig]]:
+    return [
+        (
+            dataclasses.replace(ensemble, min_confidence=conf, require_agreement=agree),
+            dataclasses.replace(risk, risk_per_trade=per_trade, daily_loss_limit=daily),
+        )
+        for conf, agree, per_trade, daily in itertools.product(
+            min_confidence, require_agreement, risk_per_trade, daily_loss_limit
+        )
+    ]
+
+
+def _init_worker(cfg: Config, meta: Dict[str, Any], specs: Dict[str, ArraySpec]) -> None:
+    # Blocked trades and exits are counted in the results; per-trade logs from
+    # every worker would only interleave on stderr.
+    logging.getLogger("ai_trading").setLevel(logging.CRITICAL)
+    arrays, blocks = attach_arrays(specs)
+    _worker.update(
+        cfg=cfg,
+        candles=arrays["candles"],
+        log=DecisionLog(**meta, **{name: arrays[name] for name in _LOG_ARRAYS}),
+        blocks=blocks,  # keep the mappings alive for the life of the worker
+    )
+
+
+def _evaluate(point: Tuple[EnsembleConfig, RiskConfig]) -> Dict[str, Any]:
+    ensemble, risk = point
+    cfg = dataclasses.replace(_worker["cfg"], ensemble=ensemble, risk=risk)
+    log: DecisionLog = _worker["log"]
+    result = asyncio.run(Backtester(cfg, {}).simulate(log.symbol, _worker["candles"], log))
+    return {
+        "min_confidence": ensemble.min_confidence,
+        "require_agreement": ensemble.require_agreement,
+        "risk_per_trade": risk.risk_per_trade,
+        "daily_loss_limit": risk.daily_loss_limit,
+        **result.stats,
+    }
+
+
+def run_sweep(
+    cfg: Config,
+    candles: np.ndarray,
+    log: DecisionLog,
+    points: List[Tuple[EnsembleConfig, RiskConfig]],
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    recorded = log.bar[log.bar < len(candles)]
+    if len(recorded) != len(log) or not np.array_equal(candles[recorded, 0], log.candle_time):
+        raise ValueError("Decision log was recorded on a different candle range")
+    meta = {"symbol": log.symbol, "timeframe": log.timeframe, "providers": log.providers}
+    arrays = {"candles": candles, **{name: getattr(log, name) for name in _LOG_ARRAYS}}
+    specs, blocks = share_arrays(arrays)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(points)))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(cfg, meta, specs)
+        ) as pool:
+            chunksize = max(1, len(points) // (workers * 4))
+            rows = list(pool.map(_evaluate, points, chunksize=chunksize))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    table = pd.DataFrame(rows)
+    if "return" in table:
+        table = table.sort_values("return", ascending=False, ignore_index=True)
+    return table
+
+
+async def _decisions(cfg: Config, args: argparse.Namespace, candles: np.ndarray) -> DecisionLog:
+    if args.replay:
+        return DecisionLog.load(args.replay)
+    return await Backtester(cfg, default_rules()).decide(args.symbol, candles)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("data", type=Path, help="CSV or Parquet file with OHLCV columns")
+    parser.add_argument("--symbol", default="BTC/USDT")
+    parser.add_argument("--timeframe", default=None, help="Candle timeframe of the data file")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--start", default=None, help="First candle time (inclusive)")
+    parser.add_argument("--end", default=None, help="Last candle time (exclusive)")
+    parser.add_argument(
+        "--replay", type=Path, default=None, help="Decisions recorded by backtest --record"
+    )
+    parser.add_argument("--min-confidence", type=float, nargs="+", default=None)
+    parser.add_argument("--require-agreement", type=int, nargs="+", default=None)
+    parser.add_argument("--risk-per-trade", type=float, nargs="+", default=None)
+    parser.add_argument("--daily-loss-limit", type=float, nargs="+", default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Default: one per CPU")
+    parser.add_argument("--output", type=Path, default=None, help="Write the table as CSV")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    cfg = Config.load(args.config)
+    if args.timeframe:
+        cfg.data.timeframe = args.timeframe
+    candles = select_range(load_ohlcv(args.data), args.start, args.end)
+    started = time.perf_counter()
+    log = asyncio.run(_decisions(cfg, args, candles))
+    decided = time.perf_counter() - started
+
+    points = grid(
+        cfg.ensemble,
+        cfg.risk,
+        args.min_confidence or [cfg.ensemble.min_confidence],
+        args.require_agreement or [cfg.ensemble.require_agreement],
+        args.risk_per_trade or [cfg.risk.risk_per_trade],
+        args.daily_loss_limit or [cfg.risk.daily_loss_limit],
+    )
+    started = time.perf_counter()
+    table = run_sweep(cfg, candles, log, points, args.workers)
+    print(
+        f"{len(points)} settings over {len(candles)} bars "
+        f"(decisions {decided:.1f}s, sweep {time.perf_counter() - started:.1f}s)"
+    )
+    columns = [column for column in SUMMARY_COLUMNS if column in table]
+    print(table[columns].head(args.top).to_string(index=False))
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,22 @@ class TradeAction(str, Enum):
     SELL = "sell"
 
 
+@dataclass
+class TokenUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    requests: int = 0
+
+    def add(self, other: "TokenUsage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+        self.requests += other.requests
+
+
 @dataclass
 class ModelDecision:
     action: TradeAction
@@ -19,6 +35,8 @@ class ModelDecision:
     take_pct: float
     reason: str
     provider: str
+    symbol: Optional[str] = None
+    provisional: bool = False
 
     def is_actionable(self, min_confidence: float) -> bool:
         return self.action != TradeAction.NONE and self.confidence >= min_confidence
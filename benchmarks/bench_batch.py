@@ -0,0 +1,62 @@
+"""Per-symbol snapshots vs one batched pass over the whole symbol universe.
+
+Usage: python -m benchmarks.bench_batch [--symbols 10 100 500] [--lookback 250]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ai_trading.config import Config
+from ai_trading.data import MarketDataClient
+from benchmarks.bench_indicators import synthetic_candles
+
+INDICATORS = ["ema", "atr", "bollinger", "vwap", "macd", "rsi_wilder"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--lookback", type=int, default=250)
+    parser.add_argument("--config", type=Path, default=Path("config.yaml"))
+    args = parser.parse_args()
+
+    cfg = Config.load(args.config)
+    cfg.data.indicators = INDICATORS
+    client = MarketDataClient(cfg, exchange=None)
+
+    for count in args.symbols:
+        candles = {f"SYM{i}/USDT": synthetic_candles(args.lookback, seed=i) for i in range(count)}
+
+        start = time.perf_counter()
+        batched = client.batch_snapshots(candles)
+        batch_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        single = {}
+        for symbol, data in candles.items():
+            frame = client.compute_features(client._to_frame(data))
+            single[symbol] = client.latest_snapshot(frame, client.extra_indicators(data))
+        single_ms = (time.perf_counter() - start) * 1e3
+
+        for symbol, snapshot in single.items():
+            other = batched[symbol]
+            for key in ("close", "rsi", "momentum_5"):
+                if not np.isclose(snapshot[key], other[key]):
+                    raise SystemExit(f"Parity failure for {symbol} {key}")
+            for key, value in snapshot["indicators"].items():
+                if not np.isclose(value, other["indicators"][key], equal_nan=True):
+                    raise SystemExit(f"Parity failure for {symbol} {key}")
+
+        print(
+            f"{count:5d} symbols: per-symbol {single_ms:9.1f} ms, batched {batch_ms:8.1f} ms "
+            f"({single_ms / batch_ms:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
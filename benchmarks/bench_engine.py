@@ -0,0 +1,226 @@
+"""End-to-end TradingEngine.run_once against the in-process fakes.
+
+Measures cycle latency, throughput (symbols/s) and memory per symbol count and
+writes the results as JSON. Pass ``--compare`` with an earlier result file to
+flag regressions.
+
+Usage: python -m benchmarks.bench_engine [--symbols 1 10 100 1000] [--cycles 5]
+           [--output benchmarks/results/engine.json] [--compare baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ai_trading.config import Config
+from ai_trading.data import MarketDataClient
+from ai_trading.engine import ExecutionFactory, TradingEngine
+from ai_trading.exchange import CcxtAsyncExchange
+from benchmarks.fakes import FakeExchange, FakeProvider
+
+PROVIDERS = ("openai", "anthropic", "grok")
+
+
+def build_engine(args: argparse.Namespace, count: int) -> tuple:
+    cfg = Config.load(args.config)
+    cfg.symbols = [f"SYM{i:04d}/USDT" for i in range(count)]
+    cfg.data.feature_mode = args.feature_mode
+    cfg.engine.max_concurrency = args.concurrency
+    cfg.prompt.batch_size = args.batch_size
+    # Every cycle sees a new candle, but keep results independent of the
+    # gate/cache tuning in the local config.
+    cfg.gate.enabled = False
+    cfg.cache.enabled = False
+    cfg.risk.kill_switch = False
+
+    fake = FakeExchange(
+        bars=cfg.data.lookback + 50,
+        timeframe=cfg.data.timeframe,
+        latency=args.exchange_latency,
+        seed=args.seed,
+        fill_on_poll=args.fill_on_poll,
+    )
+    exchange = CcxtAsyncExchange(fake)
+    providers = {
+        name: FakeProvider(name, latency=args.provider_latency, seed=args.seed)
+        for name in PROVIDERS[: args.providers]
+    }
+    engine = TradingEngine(
+        cfg,
+        providers,
+        None,
+        MarketDataClient(cfg, exchange),
+        ExecutionFactory.create(cfg, exchange, paper=False),
+    )
+    return engine, fake
+
+
+async def measure(args: argparse.Namespace, count: int) -> Dict[str, Any]:
+    engine, fake = build_engine(args, count)
+    try:
+        await engine.run_once()  # warm-up: full candle fetch, indicator state
+        if args.fill_on_poll:
+            await engine.execution.orders.poll()
+        latencies: List[float] = []
+        for _ in range(args.cycles):
+            fake.advance()
+            gc.collect()
+            start = time.perf_counter()
+            await engine.run_once()
+            if args.fill_on_poll:
+                await engine.execution.orders.poll()
+            latencies.append(time.perf_counter() - start)
+
+        fake.advance()
+        gc.collect()
+        tracemalloc.start()
+        await engine.run_once()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        await engine.aclose()
+
+    ms = np.array(latencies) * 1e3
+    return {
+        "symbols": count,
+        "cycles": args.cycles,
+        "latency_ms": {
+            "mean": float(ms.mean()),
+            "p50": float(np.percentile(ms, 50)),
+            "p95": float(np.percentile(ms, 95)),
+            "max": float(ms.max()),
+        },
+        "symbols_per_s": count / statistics.mean(latencies),
+        "peak_alloc_mb": peak / 2**20,
+        "max_rss_mb": _max_rss_mb(),
+        "orders": len(fake.orders),
+        "open_orders": len(engine.execution.orders.open_orders),
+        "exchange_calls": dict(fake.calls),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> bool:
+    baseline = {row["symbols"]: row for row in json.loads(baseline_path.read_text())["results"]}
+    ok = True
+    print(f"\nCompared with {baseline_path} (regression threshold {threshold:.0%}):")
+    for row in results:
+        before = baseline.get(row["symbols"])
+        if before is None:
+            continue
+        checks = {
+            "p50 latency": (row["latency_ms"]["p50"], before["latency_ms"]["p50"], True),
+            "throughput": (row["symbols_per_s"], before["symbols_per_s"], False),
+            "peak alloc": (row["peak_alloc_mb"], before["peak_alloc_mb"], True),
+        }
+        for label, (now, then, lower_is_better) in checks.items():
+            change = now / then - 1 if then else 0.0
+            regressed = change > threshold if lower_is_better else change < -threshold
+            ok = ok and not regressed
+            flag = "REGRESSION" if regressed else ""
+            print(
+                f"{row['symbols']:5d} symbols {label:12s} {then:10.2f} -> {now:10.2f} "
+                f"({change:+.1%}) {flag}"
+            )
+    return ok
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--config", type=Path, default=Path("config.yaml"))
+    parser.add_argument("--providers", type=int, default=2, choices=range(1, len(PROVIDERS) + 1))
+    parser.add_argument(
+        "--provider-latency", type=float, default=0.05, help="Median seconds per provider call"
+    )
+    parser.add_argument(
+        "--exchange-latency", type=float, default=0.0, help="Seconds per exchange call"
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument(
+        "--feature-mode", default="streaming", choices=["streaming", "pandas", "batch"]
+    )
+    parser.add_argument(
+        "--fill-on-poll",
+        action="store_true",
+        help="Acknowledge orders unfilled and poll them to completion after each cycle",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="JSON results file")
+    parser.add_argument(
+        "--compare", type=Path, default=None, help="Earlier results file to compare with"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed regression (fraction)"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    for count in args.symbols:
+        row = asyncio.run(measure(args, count))
+        results.append(row)
+        latency = row["latency_ms"]
+        print(
+            f"{count:5d} symbols: p50 {latency['p50']:9.1f} ms, p95 {latency['p95']:9.1f} ms, "
+            f"{row['symbols_per_s']:9.1f} symbols/s, peak alloc {row['peak_alloc_mb']:7.1f} MB"
+        )
+
+    report = {
+        "meta": {
+            "created": datetime.now(tz=timezone.utc).isoformat(),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        },
+        "results": results,
+    }
+    output = args.output or (
+        Path("benchmarks/results") / f"engine-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
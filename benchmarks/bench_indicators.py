@@ -0,0 +1,71 @@
+"""Streaming vs pandas indicator cost per cycle, with a parity check.
+
+Usage: python -m benchmarks.bench_indicators [--lookback 250] [--cycles 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ai_trading.candles import OHLCV_COLUMNS
+from ai_trading.data import MarketDataClient
+from ai_trading.indicators import IndicatorState, default_indicators
+
+
+def synthetic_candles(bars: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, bars))
+    volume = rng.uniform(1, 50, bars)
+    timestamp = 1_700_000_000_000 + np.arange(bars) * 300_000
+    return np.column_stack([timestamp, open_, high, low, close, volume])
+
+
+def pandas_features(window: np.ndarray) -> dict:
+    df = pd.DataFrame(window, columns=OHLCV_COLUMNS).set_index("timestamp")
+    latest = MarketDataClient.compute_features(df).iloc[-1]
+    return {"rsi": float(latest["rsi"]), "momentum_5": float(latest["momentum_5"])}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookback", type=int, default=250)
+    parser.add_argument("--cycles", type=int, default=500)
+    args = parser.parse_args()
+
+    candles = synthetic_candles(args.lookback + args.cycles)
+    windows = [candles[i : i + args.lookback] for i in range(args.cycles)]
+
+    state = IndicatorState(default_indicators())
+    for window in windows:
+        expected = pandas_features(window)
+        actual = state.update(window)
+        for name, value in expected.items():
+            if not np.isclose(actual[name], value, rtol=1e-9, atol=1e-9):
+                raise SystemExit(f"Parity failure for {name}: streaming {actual[name]} pandas {value}")
+    print(f"parity: ok over {args.cycles} cycles")
+
+    start = time.perf_counter()
+    for window in windows:
+        pandas_features(window)
+    pandas_us = (time.perf_counter() - start) / args.cycles * 1e6
+
+    state = IndicatorState(default_indicators())
+    state.update(windows[0])
+    start = time.perf_counter()
+    for window in windows[1:]:
+        state.update(window)
+    streaming_us = (time.perf_counter() - start) / (args.cycles - 1) * 1e6
+
+    print(f"pandas    : {pandas_us:9.1f} us/cycle")
+    print(f"streaming : {streaming_us:9.1f} us/cycle ({pandas_us / streaming_us:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
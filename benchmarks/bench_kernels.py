@@ -0,0 +1,92 @@
+"""NumPy indicator kernels vs the equivalent pandas code.
+
+Usage: python -m benchmarks.bench_kernels [--bars 250] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ai_trading.indicators import kernels
+from benchmarks.bench_indicators import synthetic_candles
+
+
+def pandas_cases(df: pd.DataFrame) -> Dict[str, Callable[[], pd.Series]]:
+    close, high, low, volume = df["close"], df["high"], df["low"], df["volume"]
+
+    def rsi() -> pd.Series:
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        return 100 - 100 / (1 + gain / loss)
+
+    def atr() -> pd.Series:
+        prev = close.shift(1)
+        tr = pd.concat([high - low, (high - prev).abs(), (low - prev).abs()], axis=1).max(axis=1)
+        return tr.ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+
+    def macd() -> pd.Series:
+        line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        return line - line.ewm(span=9, adjust=False).mean()
+
+    def vwap() -> pd.Series:
+        typical = (high + low + close) / 3
+        return (typical * volume).rolling(20).sum() / volume.rolling(20).sum()
+
+    return {
+        "ema": lambda: close.ewm(span=21, adjust=False).mean(),
+        "rsi_wilder": rsi,
+        "atr": atr,
+        "bollinger": lambda: 4 * close.rolling(20).std(ddof=0) / close.rolling(20).mean(),
+        "vwap": vwap,
+        "macd": macd,
+    }
+
+
+def numpy_cases(candles: np.ndarray) -> Dict[str, Callable[[], np.ndarray]]:
+    _, _, high, low, close, volume = candles.T
+    return {
+        "ema": lambda: kernels.ema(close, 21),
+        "rsi_wilder": lambda: kernels.wilder_rsi(close, 14),
+        "atr": lambda: kernels.atr(high, low, close, 14),
+        "bollinger": lambda: kernels.bollinger_width(close, 20, 2.0),
+        "vwap": lambda: kernels.vwap(high, low, close, volume, 20),
+        "macd": lambda: kernels.macd(close)[2],
+    }
+
+
+def run(bars: int, repeat: int) -> Dict[str, Tuple[float, float]]:
+    candles = synthetic_candles(bars)
+    df = pd.DataFrame(candles[:, 1:], columns=["open", "high", "low", "close", "volume"])
+    reference = pandas_cases(df)
+    results = {}
+    for name, func in numpy_cases(candles).items():
+        expected = reference[name]().to_numpy()
+        if not np.allclose(func(), expected, rtol=1e-8, equal_nan=True):
+            raise SystemExit(f"Parity failure for {name} ({bars} bars)")
+        numpy_us = timeit.timeit(func, number=repeat) / repeat * 1e6
+        pandas_us = timeit.timeit(reference[name], number=repeat) / repeat * 1e6
+        results[name] = (numpy_us, pandas_us)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, nargs="+", default=[250, 10_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for bars in args.bars:
+        print(f"{bars} bars (parity ok)")
+        print(f"  {'kernel':<12}{'numpy us':>12}{'pandas us':>12}{'speedup':>10}")
+        for name, (numpy_us, pandas_us) in run(bars, args.repeat).items():
+            print(f"  {name:<12}{numpy_us:>12.1f}{pandas_us:>12.1f}{pandas_us / numpy_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
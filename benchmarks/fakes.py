@@ -0,0 +1,208 @@
+"""In-process stand-ins for the exchange and the model providers.
+
+Both are deterministic for a given seed so benchmark runs can be compared.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ai_trading.candles import timeframe_ms
+from ai_trading.models.base import ModelProvider
+
+_SYMBOL_LINE = re.compile(r"^(\S+): open=", re.MULTILINE)
+
+
+class FakeExchange:
+    """ccxt.async_support-like client serving synthetic OHLCV, balances and orders.
+
+    Every symbol gets its own seeded random walk. ``advance()`` appends a bar to
+    every series so incremental fetches see a new candle, as after a real close.
+    With ``fill_on_poll`` market orders are acknowledged as open and unfilled and
+    only show up filled in ``fetch_orders``, like exchanges that fill asynchronously.
+    """
+
+    def __init__(
+        self,
+        bars: int = 500,
+        timeframe: str = "5m",
+        latency: float = 0.0,
+        balance: float = 100_000.0,
+        seed: int = 0,
+        fill_on_poll: bool = False,
+    ) -> None:
+        self.bars = bars
+        self.interval = timeframe_ms(timeframe)
+        self.latency = latency
+        self.balance = balance
+        self.seed = seed
+        self.fill_on_poll = fill_on_poll
+        self.orders: List[Dict[str, Any]] = []
+        self.calls: Dict[str, int] = {}
+        self._series: Dict[str, np.ndarray] = {}
+        self._order_ids = itertools.count(1)
+        self._start = 1_700_000_000_000
+
+    def advance(self) -> None:
+        for symbol, series in self._series.items():
+            self._series[symbol] = np.vstack([series, self._next_bar(symbol, series[-1])])
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "5m",
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[List[float]]:
+        await self._request("fetch_ohlcv")
+        series = self._get_series(symbol)
+        if since is not None:
+            series = series[series[:, 0] >= since]
+            if limit:
+                series = series[:limit]
+        elif limit:
+            series = series[-limit:]
+        return series.tolist()
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        await self._request("fetch_ticker")
+        return self._ticker(symbol)
+
+    async def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        await self._request("fetch_tickers")
+        return {symbol: self._ticker(symbol) for symbol in symbols or self._series}
+
+    async def fetch_balance(self) -> Dict[str, Any]:
+        await self._request("fetch_balance")
+        return {"total": {"USDT": self.balance}, "free": {"USDT": self.balance}}
+
+    async def create_market_order(self, symbol: str, side: str, amount: float) -> Dict[str, Any]:
+        await self._request("create_market_order")
+        order = {
+            "id": str(next(self._order_ids)),
+            "symbol": symbol,
+            "side": side,
+            "amount": amount,
+            "filled": amount,
+            "price": float(self._get_series(symbol)[-1, 4]),
+            "status": "closed",
+            "timestamp": self._start,
+        }
+        self.orders.append(order)
+        if self.fill_on_poll:
+            return {**order, "filled": 0.0, "status": "open"}
+        return dict(order)
+
+    async def fetch_orders(
+        self, symbol: str, since: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        await self._request("fetch_orders")
+        return [dict(order) for order in self.orders if order["symbol"] == symbol]
+
+    async def fetch_open_orders(
+        self, symbol: str, since: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        await self._request("fetch_open_orders")
+        return []
+
+    async def fetch_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        await self._request("fetch_order")
+        return next(dict(order) for order in self.orders if order["id"] == order_id)
+
+    async def close(self) -> None:
+        return None
+
+    async def _request(self, method: str) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _ticker(self, symbol: str) -> Dict[str, Any]:
+        last = self._get_series(symbol)[-1]
+        return {"symbol": symbol, "timestamp": int(last[0]), "last": float(last[4])}
+
+    def _get_series(self, symbol: str) -> np.ndarray:
+        series = self._series.get(symbol)
+        if series is None:
+            rng = np.random.default_rng([self.seed, _stable_hash(symbol)])
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, self.bars)))
+            open_ = np.concatenate([[close[0]], close[:-1]])
+            high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, self.bars))
+            low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, self.bars))
+            volume = rng.uniform(1, 50, self.bars)
+            timestamp = self._start + np.arange(self.bars) * self.interval
+            series = np.column_stack([timestamp, open_, high, low, close, volume])
+            self._series[symbol] = series
+        return series
+
+    def _next_bar(self, symbol: str, last: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng([self.seed, _stable_hash(symbol), int(last[0])])
+        open_ = last[4]
+        close = open_ * float(np.exp(rng.normal(0, 0.004)))
+        high = max(open_, close) * (1 + rng.uniform(0, 0.002))
+        low = min(open_, close) * (1 - rng.uniform(0, 0.002))
+        return np.array([last[0] + self.interval, open_, high, low, close, rng.uniform(1, 50)])
+
+
+class FakeProvider(ModelProvider):
+    """Model provider with a configurable latency and decision distribution.
+
+    Latency is log-normal around ``latency`` seconds with ``jitter`` as the sigma
+    of the underlying normal; ``weights`` gives the relative odds of buy, sell
+    and hold. Batched prompts get one entry per symbol in the prompt. Latency and
+    decisions are drawn from an RNG seeded by the prompt, so they do not depend
+    on the order in which concurrent calls finish.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        latency: float = 0.2,
+        jitter: float = 0.3,
+        weights: Optional[Dict[str, float]] = None,
+        confidence: Sequence[float] = (0.5, 0.95),
+        seed: int = 0,
+    ) -> None:
+        super().__init__(name)
+        self.model = f"fake-{name}"
+        self.latency = latency
+        self.jitter = jitter
+        self.weights = weights or {"buy": 0.3, "sell": 0.3, "hold": 0.4}
+        self.confidence = tuple(confidence)
+        self.calls = 0
+        self.seed = seed
+
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        self.calls += 1
+        rng = random.Random(f"{self.seed}:{self.name}:{_stable_hash(prompt)}")
+        if "Symbols:" in prompt:
+            symbols = _SYMBOL_LINE.findall(prompt)
+            reply = {"decisions": [{"symbol": s, **self._decision(rng)} for s in symbols]}
+        else:
+            reply = self._decision(rng)
+        if self.latency:
+            await asyncio.sleep(self.latency * rng.lognormvariate(0, self.jitter))
+        return json.dumps(reply)
+
+    def _decision(self, rng: random.Random) -> Dict[str, Any]:
+        actions, weights = zip(*self.weights.items())
+        return {
+            "action": rng.choices(actions, weights)[0],
+            "confidence": round(rng.uniform(*self.confidence), 3),
+            "stop_pct": 0.01,
+            "take_pct": 0.02,
+            "reason": "synthetic",
+        }
+
+
+def _stable_hash(text: str) -> int:
+    # hash() is salted per process; benchmarks must see the same series every run.
+    return zlib.crc32(text.encode())
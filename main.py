@@ -9,6 +9,9 @@ from dotenv import load_dotenv
 
 from ai_trading.config import Config, DEFAULT_CONFIG_PATH
 from ai_trading.engine import TradingEngine
+from ai_trading.metrics import start_exporter
+from ai_trading.profiling import CycleProfiler
+from ai_trading.scheduler import CandleScheduler, schedule_jobs
 
 
 logging.basicConfig(
@@ -21,7 +24,12 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="AI ensemble trading bot")
     parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH, help="Config file")
     parser.add_argument("--symbols", type=str, default="BTC/USDT", help="Comma separated symbols")
-    parser.add_argument("--timeframe", type=str, default="5m", help="Timeframe to trade")
+    parser.add_argument(
+        "--timeframe",
+        type=str,
+        default=None,
+        help="Comma separated timeframes to trade (defaults to the config)",
+    )
     mode = parser.add_mutually_exclusive_group()
     mode.add_argument("--paper", action="store_true", help="Run in paper trading mode")
     mode.add_argument("--live", action="store_true", help="Run with live orders")
@@ -31,10 +39,41 @@ def parse_args() -> argparse.Namespace:
         help="Run a single iteration instead of continuous loop",
     )
     parser.add_argument(
-        "--sleep",
+        "--offset",
+        type=float,
+        default=None,
+        help="Seconds after each candle close to start a cycle",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port",
+    )
+    parser.add_argument(
+        "--profile",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Profile N back-to-back cycles, write the results and exit",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=Path("profiles"),
+        help="Directory for profiling output",
+    )
+    parser.add_argument(
+        "--profile-top",
         type=int,
-        default=60,
-        help="Seconds to wait between iterations in live loop",
+        default=20,
+        help="Number of hotspots to print in the profiling summary",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum number of symbols processed concurrently per cycle",
     )
     return parser.parse_args()
 
@@ -44,18 +83,49 @@ async def main() -> None:
     load_dotenv()
     cfg = Config.load(args.config)
     cfg.symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
-    cfg.data.timeframe = args.timeframe
+    if args.timeframe:
+        timeframes = [t.strip() for t in args.timeframe.split(",") if t.strip()]
+        cfg.data.timeframe = timeframes[0]
+        cfg.schedule.timeframes = {timeframe: None for timeframe in timeframes}
+    if args.offset is not None:
+        cfg.schedule.offset_seconds = args.offset
+    if args.metrics_port is not None:
+        cfg.metrics.exporter = True
+        cfg.metrics.port = args.metrics_port
+    if args.concurrency is not None:
+        cfg.engine.max_concurrency = args.concurrency
     paper = True if args.paper or not args.live else False
 
     engine = TradingEngine.from_env(cfg=cfg, paper=paper)
+    scheduler = CandleScheduler(
+        cfg.schedule,
+        schedule_jobs(cfg),
+        lambda timeframe, symbols: engine.run_once(symbols, timeframe),
+    )
+
+    exporter = None
+    if cfg.metrics.exporter:
+        exporter = await start_exporter(cfg.metrics.host, cfg.metrics.port)
+
+    try:
+        if args.profile:
+            profiler = CycleProfiler(args.profile_dir, top=args.profile_top)
+            await profiler.run(scheduler.run_once, args.profile)
+            paths = profiler.write()
+            print(profiler.summary())
+            print("Profiling output: " + ", ".join(str(path) for path in paths.values()))
+            return
 
-    if args.once:
-        await engine.run_once()
-        return
+        if args.once:
+            await scheduler.run_once()
+            return
 
-    while True:
-        await engine.run_once()
-        await asyncio.sleep(args.sleep)
+        await scheduler.run()
+    finally:
+        if exporter is not None:
+            exporter.close()
+            await exporter.wait_closed()
+        await engine.aclose()
 
 
 if __name__ == "__main__":
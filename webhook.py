@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import logging
 import os
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 
-from fastapi import Depends, FastAPI, Header, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Response, status
 from pydantic import BaseModel
 
-from ai_trading.config import Config, DEFAULT_CONFIG_PATH
+from ai_trading.config import Config, ConfigStore, DEFAULT_CONFIG_PATH
 from ai_trading.engine import TradingEngine
-from ai_trading.types import TradeAction
+from ai_trading.metrics import CONTENT_TYPE, REGISTRY
+from ai_trading.signals import Signal, SignalQueue, SignalStatus
+from ai_trading.types import OrderResult, TradeAction
 
 LOGGER = logging.getLogger(__name__)
 app = FastAPI()
 
 _engine: Optional[TradingEngine] = None
 _engine_lock = asyncio.Lock()
+_config_store: Optional[ConfigStore] = None
+_signal_queue: Optional[SignalQueue] = None
 
 
 class SignalPayload(BaseModel):
@@ -28,42 +34,148 @@ class SignalPayload(BaseModel):
     take_pct: float
 
 
-async def get_engine() -> TradingEngine:
+class SignalBatch(BaseModel):
+    signals: List[SignalPayload]
+
+
+async def get_config_store() -> ConfigStore:
+    global _config_store  # pylint: disable=global-statement
+    if _config_store is None:
+        _config_store = ConfigStore(Path(os.getenv("AITRADING_CONFIG", DEFAULT_CONFIG_PATH)))
+        _config_store.subscribe(_apply_config)
+    return _config_store
+
+
+async def get_config(store: ConfigStore = Depends(get_config_store)) -> Config:
+    return store.get()
+
+
+def _apply_config(cfg: Config) -> None:
+    if _engine is not None:
+        _engine.reconfigure(cfg)
+    if _signal_queue is not None:
+        _signal_queue.cfg = cfg.signals
+
+
+async def get_engine(cfg: Config = Depends(get_config)) -> TradingEngine:
     global _engine  # pylint: disable=global-statement
     async with _engine_lock:
         if _engine is None:
-            config_path = os.getenv("AITRADING_CONFIG", DEFAULT_CONFIG_PATH)
-            cfg = Config.load(config_path)
             _engine = TradingEngine.from_env(cfg=cfg, paper=not bool(os.getenv("AITRADING_LIVE")))
         return _engine
 
 
-def verify_secret(secret: Optional[str] = Header(default=None, alias="X-Webhook-Secret")) -> None:
-    cfg = Config.load(DEFAULT_CONFIG_PATH)
+async def get_signal_queue(engine: TradingEngine = Depends(get_engine)) -> SignalQueue:
+    global _signal_queue  # pylint: disable=global-statement
+    async with _engine_lock:
+        if _signal_queue is None:
+            _signal_queue = SignalQueue(engine.cfg.signals, lambda signal: _execute(engine, signal))
+            _signal_queue.start()
+        return _signal_queue
+
+
+@app.on_event("shutdown")
+async def shutdown_engine() -> None:
+    global _engine, _signal_queue  # pylint: disable=global-statement
+    async with _engine_lock:
+        if _signal_queue is not None:
+            await _signal_queue.stop()
+            _signal_queue = None
+        if _engine is not None:
+            await _engine.aclose()
+            _engine = None
+
+
+async def verify_secret(
+    secret: Optional[str] = Header(default=None, alias="X-Webhook-Secret"),
+    cfg: Config = Depends(get_config),
+) -> None:
     if cfg.webhook_secret and secret != cfg.webhook_secret:
         LOGGER.warning("Invalid webhook secret")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid secret")
 
 
-@app.post("/signal")
-async def receive_signal(payload: SignalPayload, engine: TradingEngine = Depends(get_engine)):
-    verify_secret()
-    side = payload.side.lower()
-    if side not in {"buy", "sell"}:
-        raise HTTPException(status_code=400, detail="side must be buy or sell")
-    decision = TradeAction.BUY if side == "buy" else TradeAction.SELL
-    LOGGER.info("Received webhook signal for %s: %s", payload.symbol, side)
+@app.get("/metrics")
+async def metrics() -> Response:
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.post("/config/reload", dependencies=[Depends(verify_secret)])
+async def reload_config(store: ConfigStore = Depends(get_config_store)):
     try:
-        ohlcv = engine.market_data.fetch_ohlcv(payload.symbol)
-        price = float(ohlcv["close"].iloc[-1])
+        store.reload()
     except Exception as exc:  # pylint: disable=broad-except
-        LOGGER.exception("Failed to fetch latest price: %s", exc)
-        raise HTTPException(status_code=500, detail="Failed to fetch price") from exc
-    engine.execution.execute(
-        payload.symbol,
-        decision,
-        price=price,
+        LOGGER.error("Config reload failed: %s", exc)
+        raise HTTPException(status_code=400, detail=f"Invalid config: {exc}") from exc
+    return {"status": "reloaded", "mtime_ns": store.mtime}
+
+
+def _to_signal(payload: SignalPayload) -> Signal:
+    side = payload.side.lower()
+    if side not in {"buy", "sell"}:
+        raise ValueError("side must be buy or sell")
+    return Signal(
+        symbol=payload.symbol,
+        action=TradeAction.BUY if side == "buy" else TradeAction.SELL,
         stop_pct=payload.stop_pct,
         take_pct=payload.take_pct,
+        confidence=payload.confidence,
+        reason=payload.reason,
     )
-    return {"status": "ok"}
+
+
+def _accepted(signal_status: SignalStatus, coalesced: bool) -> dict:
+    return {"id": signal_status.id, "status": signal_status.status, "coalesced": coalesced}
+
+
+async def _execute(engine: TradingEngine, signal: Signal) -> Optional[OrderResult]:
+    if engine.prices is not None:
+        price = await engine.prices.price(signal.symbol)
+    else:
+        ohlcv = await engine.market_data.fetch_ohlcv(signal.symbol)
+        price = float(ohlcv["close"].iloc[-1])
+    return await engine.execution.execute(
+        signal.symbol,
+        signal.action,
+        price=price,
+        stop_pct=signal.stop_pct,
+        take_pct=signal.take_pct,
+    )
+
+
+@app.post("/signal", status_code=202, dependencies=[Depends(verify_secret)])
+async def receive_signal(payload: SignalPayload, queue: SignalQueue = Depends(get_signal_queue)):
+    try:
+        signal = _to_signal(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    LOGGER.info("Received webhook signal for %s: %s", signal.symbol, signal.action.value)
+    try:
+        return _accepted(*queue.submit(signal))
+    except asyncio.QueueFull as exc:
+        LOGGER.warning("Signal queue full; rejecting %s", signal.symbol)
+        raise HTTPException(status_code=503, detail="Signal queue is full") from exc
+
+
+@app.post("/signals", status_code=202, dependencies=[Depends(verify_secret)])
+async def receive_signals(batch: SignalBatch, queue: SignalQueue = Depends(get_signal_queue)):
+    LOGGER.info("Received %d webhook signals", len(batch.signals))
+    results = []
+    for payload in batch.signals:
+        try:
+            results.append(_accepted(*queue.submit(_to_signal(payload))))
+        except ValueError as exc:
+            results.append({"symbol": payload.symbol, "status": "rejected", "error": str(exc)})
+        except asyncio.QueueFull:
+            results.append(
+                {"symbol": payload.symbol, "status": "rejected", "error": "Signal queue is full"}
+            )
+    return {"results": results}
+
+
+@app.get("/signals/{signal_id}", dependencies=[Depends(verify_secret)])
+async def signal_status(signal_id: str, queue: SignalQueue = Depends(get_signal_queue)):
+    found = queue.status(signal_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Unknown signal id")
+    return dataclasses.asdict(found)